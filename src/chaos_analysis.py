@@ -22,9 +22,27 @@ from mpl_toolkits.mplot3d import Axes3D
 import matplotlib.animation as animation
 from matplotlib.colors import LinearSegmentedColormap
 import os
+import functools
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from result_cache import cached
+from poincare_maps import runge_kutta_4th
+from parameter_sweep import default_workers
+from figure_build import figure_target, build_figures
 import warnings
 warnings.filterwarnings('ignore')
 
+# numba is optional: without it the fixed-step kernels fall back to NumPy code
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(func):
+        """No-op stand-in for numba.njit"""
+        return func
+
 # Set up paths for saving figures
 script_dir = os.path.dirname(os.path.abspath(__file__))
 repo_root = os.path.dirname(script_dir)
@@ -60,19 +78,95 @@ def iterate_logistic(r, x0, n_iterations=1000, n_transient=100):
     
     return np.array(trajectory)
 
+def logistic_bifurcation_batch(r_values, x0=0.5, n_transient=1000, n_keep=100,
+                               max_chunk_bytes=64 * 1024**2, out=None):
+    """Iterate the logistic map for a whole grid of r values at once.
+
+    Every step advances all r-values of a chunk as one NumPy array, and the
+    last ``n_keep`` iterates are written straight into an (n_r, n_keep)
+    float array. The r-grid is processed in chunks so that the working set
+    (chunk rows of the output plus two scratch arrays) stays below
+    ``max_chunk_bytes``. Pass ``out`` (e.g. an ``np.memmap``) to write very
+    large diagrams without holding them in memory.
+    """
+    r_values = np.atleast_1d(np.asarray(r_values, dtype=float))
+    n_r = r_values.size
+    if out is None:
+        out = np.empty((n_r, n_keep))
+    elif out.shape != (n_r, n_keep):
+        raise ValueError(f"out must have shape {(n_r, n_keep)}, got {out.shape}")
+    
+    chunk_size = max(1, int(max_chunk_bytes // (8 * (n_keep + 2))))
+    
+    for start in range(0, n_r, chunk_size):
+        r = r_values[start:start + chunk_size]
+        x = np.full(r.shape, x0, dtype=float)
+        rx = np.empty_like(x)
+        block = np.empty((r.size, n_keep))
+        
+        # Same operation order as logistic_map: (r * x) * (1 - x), in place
+        for j in range(n_transient + n_keep):
+            np.multiply(r, x, out=rx)
+            np.subtract(1.0, x, out=x)
+            x *= rx
+            if j >= n_transient:
+                block[:, j - n_transient] = x
+        
+        out[start:start + chunk_size] = block
+    
+    return out
+
+def lyapunov_spectrum(r_values, map_func=logistic_map, derivative_func=logistic_map_derivative,
+                      x0=0.5, n_iterations=10000, n_transient=0, tol=None, check_every=500):
+    """Calculate Lyapunov exponents of a 1D map for a whole vector of parameters.
+
+    ``map_func(r, x)`` and ``derivative_func(r, x)`` must accept NumPy arrays.
+    All parameter lanes are iterated together and log|f'(x)| is accumulated
+    as an array. With ``tol`` set, the running estimate of every lane is
+    checked each ``check_every`` iterations and lanes whose estimate moved
+    by less than ``tol`` are retired, so the remaining work shrinks as the
+    spectrum converges.
+    """
+    r_values = np.atleast_1d(np.asarray(r_values, dtype=float))
+    lyapunov = np.empty(r_values.shape)
+    
+    x = np.full(r_values.shape, x0, dtype=float)
+    for _ in range(n_transient):
+        x = map_func(r_values, x)
+    
+    # Indices and state of the lanes that are still being iterated
+    active = np.arange(r_values.size)
+    r = r_values
+    log_sum = np.zeros(r_values.shape)
+    previous = np.full(r_values.shape, np.nan)
+    n_done = 0
+    
+    while n_done < n_iterations and active.size:
+        block = min(check_every, n_iterations - n_done)
+        for _ in range(block):
+            x = map_func(r, x)
+            # Skip log(0) terms, as in the scalar version
+            derivative = np.abs(derivative_func(r, x))
+            log_sum += np.log(np.where(derivative > 1e-15, derivative, 1.0))
+        n_done += block
+        estimate = log_sum / n_done
+        
+        if tol is not None:
+            converged = np.abs(estimate - previous) < tol
+            if np.any(converged):
+                lyapunov[active[converged]] = estimate[converged]
+                keep = ~converged
+                active, r, x = active[keep], r[keep], x[keep]
+                log_sum, estimate = log_sum[keep], estimate[keep]
+        previous = estimate
+    
+    lyapunov[active] = log_sum / max(n_done, 1)
+    
+    return lyapunov
+
 def calculate_lyapunov_logistic(r, x0=0.5, n_iterations=10000):
     """Calculate Lyapunov exponent for logistic map"""
-    x = x0
-    lyap_sum = 0.0
-    
-    for _ in range(n_iterations):
-        x = logistic_map(r, x)
-        # Avoid log(0) by adding small epsilon
-        derivative = abs(logistic_map_derivative(r, x))
-        if derivative > 1e-15:
-            lyap_sum += np.log(derivative)
-    
-    return lyap_sum / n_iterations
+    return lyapunov_spectrum(r, x0=x0, n_iterations=n_iterations)[0]
 
 def lorenz_system(state, t, sigma=10.0, rho=28.0, beta=8.0/3.0):
     """Lorenz system differential equations"""
@@ -82,40 +176,294 @@ def lorenz_system(state, t, sigma=10.0, rho=28.0, beta=8.0/3.0):
     dz_dt = x * y - beta * z
     return np.array([dx_dt, dy_dt, dz_dt])
 
-def runge_kutta_4th(func, state, t, dt, *args):
-    """4th order Runge-Kutta integration"""
-    k1 = func(state, t, *args)
-    k2 = func(state + 0.5*dt*k1, t + 0.5*dt, *args)
-    k3 = func(state + 0.5*dt*k2, t + 0.5*dt, *args)
-    k4 = func(state + dt*k3, t + dt, *args)
-    return state + (dt/6.0) * (k1 + 2*k2 + 2*k3 + k4)
+@njit
+def lorenz_rhs(state, t, params, out):
+    """In-place Lorenz equations for rk4_fixed_step; params = (sigma, rho, beta)"""
+    sigma, rho, beta = params
+    x = state[0]
+    y = state[1]
+    z = state[2]
+    out[0] = sigma * (y - x)
+    out[1] = x * (rho - z) - y
+    out[2] = x * y - beta * z
+
+@njit
+def _rk4_fill(rhs, trajectory, t0, dt, params, k1, k2, k3, k4, tmp):
+    """RK4 kernel over preallocated stage buffers, filling trajectory row by row"""
+    n_steps, dim = trajectory.shape
+    for i in range(n_steps - 1):
+        t = t0 + i * dt
+        y = trajectory[i]
+        rhs(y, t, params, k1)
+        for j in range(dim):
+            tmp[j] = y[j] + 0.5 * dt * k1[j]
+        rhs(tmp, t + 0.5 * dt, params, k2)
+        for j in range(dim):
+            tmp[j] = y[j] + 0.5 * dt * k2[j]
+        rhs(tmp, t + 0.5 * dt, params, k3)
+        for j in range(dim):
+            tmp[j] = y[j] + dt * k3[j]
+        rhs(tmp, t + dt, params, k4)
+        next_state = trajectory[i + 1]
+        for j in range(dim):
+            next_state[j] = y[j] + (dt / 6.0) * (k1[j] + 2 * k2[j] + 2 * k3[j] + k4[j])
+
+def _rk4_fill_numpy(rhs, trajectory, t0, dt, params, k1, k2, k3, k4, tmp):
+    """Pure-NumPy version of _rk4_fill: whole-vector stage updates into the same buffers"""
+    for i in range(trajectory.shape[0] - 1):
+        t = t0 + i * dt
+        y = trajectory[i]
+        rhs(y, t, params, k1)
+        np.multiply(k1, 0.5 * dt, out=tmp)
+        tmp += y
+        rhs(tmp, t + 0.5 * dt, params, k2)
+        np.multiply(k2, 0.5 * dt, out=tmp)
+        tmp += y
+        rhs(tmp, t + 0.5 * dt, params, k3)
+        np.multiply(k3, dt, out=tmp)
+        tmp += y
+        rhs(tmp, t + dt, params, k4)
+        np.add(k2, k3, out=tmp)
+        tmp *= 2
+        tmp += k1
+        tmp += k4
+        tmp *= dt / 6.0
+        np.add(y, tmp, out=trajectory[i + 1])
+
+def rk4_fixed_step(rhs, initial_state, dt, num_steps, params=(), t0=0.0, out=None):
+    """Fixed-step RK4 integration written straight into a trajectory buffer.
+
+    ``rhs(state, t, params, out)`` writes the derivative into ``out`` in
+    place (see ``lorenz_rhs``), so no arrays are allocated per step. Row i
+    of the returned (num_steps, dim) array is the state at ``t0 + i*dt``.
+    With numba installed the loop (and an ``@njit`` rhs) is compiled;
+    without it each step updates the stage buffers as whole vectors.
+    """
+    initial_state = np.asarray(initial_state, dtype=float)
+    dim = initial_state.size
+    if out is None:
+        out = np.empty((num_steps, dim))
+    out[0] = initial_state
+    
+    k1, k2, k3, k4, tmp = (np.empty(dim) for _ in range(5))
+    params = tuple(float(p) for p in params)
+    kernel = _rk4_fill if HAS_NUMBA else _rk4_fill_numpy
+    kernel(rhs, out, float(t0), float(dt), params, k1, k2, k3, k4, tmp)
+    
+    return out
 
-def generate_lorenz_attractor(initial_state=[1.0, 1.0, 1.0], dt=0.01, num_steps=10000):
+@cached
+def generate_lorenz_attractor(initial_state=[1.0, 1.0, 1.0], dt=0.01, num_steps=10000,
+                              sigma=10.0, rho=28.0, beta=8.0/3.0):
     """Generate Lorenz attractor trajectory"""
-    trajectory = np.zeros((num_steps, 3))
-    state = np.array(initial_state)
+    return rk4_fixed_step(lorenz_rhs, initial_state, dt, num_steps, (sigma, rho, beta))
+
+def lorenz_ensemble_rhs(states, t, params):
+    """Lorenz equations for an (N, 3) ensemble; params columns are (sigma, rho, beta)"""
+    sigma, rho, beta = params.T
+    x, y, z = states[:, 0], states[:, 1], states[:, 2]
+    derivatives = np.empty_like(states)
+    derivatives[:, 0] = sigma * (y - x)
+    derivatives[:, 1] = x * (rho - z) - y
+    derivatives[:, 2] = x * y - beta * z
+    return derivatives
+
+def rossler_ensemble_rhs(states, t, params):
+    """Rössler equations for an (N, 3) ensemble; params columns are (a, b, c)"""
+    a, b, c = params.T
+    x, y, z = states[:, 0], states[:, 1], states[:, 2]
+    derivatives = np.empty_like(states)
+    derivatives[:, 0] = -y - z
+    derivatives[:, 1] = x + a * y
+    derivatives[:, 2] = b + z * (x - c)
+    return derivatives
+
+def iterate_ensemble(rhs, initial_states, dt, num_steps, params, t0=0.0, save_every=1):
+    """Advance an (N, d) ensemble in lock-step with vectorized RK4.
+
+    ``params`` is either one parameter tuple shared by all members or an
+    (N, p) array with one row per member. Yields ``(t, states)`` snapshots
+    every ``save_every`` steps, starting with the initial states, so long
+    runs of large ensembles can be reduced on the fly.
+    """
+    states = np.array(initial_states, dtype=float)
+    params = np.asarray(params, dtype=float)
+    if params.ndim == 1:
+        params = params[np.newaxis, :]
+    
+    yield t0, states.copy()
+    for i in range(1, num_steps):
+        t = t0 + (i - 1) * dt
+        states = runge_kutta_4th(rhs, states, t, dt, params)
+        if i % save_every == 0:
+            yield t + dt, states.copy()
+
+def integrate_ensemble(rhs, initial_states, dt, num_steps, params, t0=0.0, save_every=1):
+    """Integrate an (N, d) ensemble and return a (n_saved, N, d) array of snapshots"""
+    initial_states = np.asarray(initial_states, dtype=float)
+    n_saved = (num_steps - 1) // save_every + 1
+    trajectories = np.empty((n_saved,) + initial_states.shape)
     
-    for i in range(num_steps):
-        trajectory[i] = state
-        state = runge_kutta_4th(lorenz_system, state, i*dt, dt)
+    snapshots = iterate_ensemble(rhs, initial_states, dt, num_steps, params, t0, save_every)
+    for k, (_, states) in enumerate(snapshots):
+        trajectories[k] = states
     
-    return trajectory
+    return trajectories
 
-def julia_set(c, width=800, height=600, max_iter=100, x_range=(-2, 2), y_range=(-1.5, 1.5)):
-    """Generate Julia set fractal"""
+def complex_plane_rows(x_range, y_range, width, height, rows):
+    """Complex coordinates of the given rows of a width x height grid"""
     x = np.linspace(x_range[0], x_range[1], width)
     y = np.linspace(y_range[0], y_range[1], height)
-    X, Y = np.meshgrid(x, y)
-    Z = X + 1j*Y
-    
-    iterations = np.zeros(Z.shape, dtype=int)
-    
-    for i in range(max_iter):
-        mask = np.abs(Z) <= 2
-        Z[mask] = Z[mask]**2 + c
-        iterations[mask] = i
-    
-    return iterations
+    return x[np.newaxis, :] + 1j*y[rows, np.newaxis]
+
+def complex_plane_row_slices(width, height, max_tile_pixels=1 << 20):
+    """Split the rows of a width x height grid into tiles of at most max_tile_pixels points"""
+    tile_rows = max(1, max_tile_pixels // width)
+    return [slice(start, min(start + tile_rows, height)) for start in range(0, height, tile_rows)]
+
+def complex_plane_tiles(x_range, y_range, width, height, max_tile_pixels=1 << 20):
+    """Yield (row_slice, Z) blocks of a width x height complex grid, a few rows at a time"""
+    for rows in complex_plane_row_slices(width, height, max_tile_pixels):
+        yield rows, complex_plane_rows(x_range, y_range, width, height, rows)
+
+def _render_tile_into_shared(tile_func, shm_name, shape, dtype, x_range, y_range, rows):
+    """Worker: evaluate one row tile and write it into the shared output array"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        out = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        Z = complex_plane_rows(x_range, y_range, shape[1], shape[0], rows)
+        out[rows] = tile_func(Z)
+        del out
+    finally:
+        shm.close()
+
+def render_tiles(tile_func, x_range, y_range, width, height, dtype=float, n_workers=1,
+                 max_tile_pixels=1 << 18, executor=None, channels=None):
+    """Evaluate ``tile_func(Z)`` over the complex plane tile by tile.
+
+    With ``n_workers == 1`` the tiles are rendered in this process. Otherwise
+    they are evaluated in a process pool (``n_workers=None`` uses
+    ``default_workers()`` processes, or pass an existing ``executor`` to reuse it across frames) and every
+    worker writes its rows directly into a shared-memory output array.
+    ``tile_func`` must then be picklable, e.g. a module-level function or a
+    ``functools.partial`` of one. If ``channels`` is given, ``tile_func``
+    returns (rows, width, channels) blocks and so does the result.
+    """
+    shape = (height, width) if channels is None else (height, width, channels)
+    tiles = complex_plane_row_slices(width, height, max_tile_pixels)
+    if n_workers is None:
+        n_workers = default_workers()
+    
+    if n_workers == 1 and executor is None:
+        out = np.empty(shape, dtype=dtype)
+        for rows in tiles:
+            out[rows] = tile_func(complex_plane_rows(x_range, y_range, width, height, rows))
+        return out
+    
+    dtype = np.dtype(dtype)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * dtype.itemsize))
+    try:
+        pool = executor if executor is not None else ProcessPoolExecutor(max_workers=n_workers)
+        try:
+            futures = [pool.submit(_render_tile_into_shared, tile_func, shm.name, shape, dtype,
+                                   x_range, y_range, rows)
+                       for rows in tiles]
+            for future in futures:
+                future.result()
+        finally:
+            if executor is None:
+                pool.shutdown()
+        out = np.ndarray(shape, dtype=dtype, buffer=shm.buf).copy()
+    finally:
+        shm.close()
+        shm.unlink()
+    
+    return out
+
+def escape_time(z0, step, finished, max_iter):
+    """Iterate points until ``finished(z)`` holds, shrinking the work as they finish.
+
+    ``step(z, index)`` maps the still-active values to their next iterate;
+    ``index`` holds their positions in ``z0`` (e.g. for per-pixel c values).
+    Only the active points are kept in a compacted array, so each iteration
+    costs time proportional to the points that are still running.
+    Returns ``(counts, z_final)``: the first iteration at which each point
+    finished (``max_iter`` if it never did) and its value at that moment.
+    """
+    z = np.array(z0, dtype=complex).ravel()
+    counts = np.full(z.size, max_iter, dtype=int)
+    z_final = np.empty_like(z)
+    active = np.arange(z.size)
+    
+    for k in range(max_iter):
+        done = finished(z)
+        if np.any(done):
+            counts[active[done]] = k
+            z_final[active[done]] = z[done]
+            keep = ~done
+            active, z = active[keep], z[keep]
+            if active.size == 0:
+                break
+        z = step(z, active)
+    
+    z_final[active] = z
+    
+    return counts, z_final
+
+def escaped_radius2(z, radius2=4.0):
+    """Escape test |z|^2 > radius^2, without taking a square root"""
+    return z.real*z.real + z.imag*z.imag > radius2
+
+def smooth_iteration_count(counts, z_final, max_iter):
+    """Continuous escape count n + 1 - log2(log|z_n|); points that never escaped get max_iter"""
+    smooth = counts.astype(float)
+    escaped = counts < max_iter
+    log_abs = 0.5 * np.log(np.abs(z_final[escaped])**2)
+    smooth[escaped] += 1 - np.log2(np.maximum(log_abs, 1e-300))
+    return smooth
+
+def julia_tile(Z, c, max_iter=100, smooth=False):
+    """Escape-time counts of z -> z^2 + c for one block of starting points"""
+    counts, z_final = escape_time(Z, lambda z, index: z*z + c, escaped_radius2, max_iter)
+    if smooth:
+        tile = smooth_iteration_count(counts, z_final, max_iter)
+    else:
+        # Last iteration at which the point was still bounded, as before
+        tile = np.maximum(counts - 1, 0)
+    return tile.reshape(Z.shape)
+
+def julia_set(c, width=800, height=600, max_iter=100, x_range=(-2, 2), y_range=(-1.5, 1.5),
+              smooth=False, max_tile_pixels=1 << 20, n_workers=1, executor=None):
+    """Generate Julia set fractal.
+
+    The grid is rendered in row tiles of at most ``max_tile_pixels`` points
+    so peak memory stays bounded for very large images. With ``smooth`` a
+    continuous iteration count is returned instead of integer counts.
+    ``n_workers``/``executor`` spread the tiles over processes (see render_tiles).
+    """
+    tile_func = functools.partial(julia_tile, c=c, max_iter=max_iter, smooth=smooth)
+    return render_tiles(tile_func, x_range, y_range, width, height,
+                        dtype=float if smooth else int, n_workers=n_workers,
+                        max_tile_pixels=max_tile_pixels, executor=executor)
+
+def julia_sweep(c_values, width=800, height=600, max_iter=100, x_range=(-2, 2), y_range=(-1.5, 1.5),
+                smooth=False, n_workers=None, max_tile_pixels=1 << 18):
+    """Render one Julia set per c value (e.g. animation frames) on a shared process pool"""
+    frames = np.empty((len(c_values), height, width), dtype=float if smooth else int)
+    if n_workers is None:
+        n_workers = default_workers()
+    
+    if n_workers == 1:
+        for k, c in enumerate(c_values):
+            frames[k] = julia_set(c, width, height, max_iter, x_range, y_range, smooth, max_tile_pixels)
+        return frames
+    
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        for k, c in enumerate(c_values):
+            frames[k] = julia_set(c, width, height, max_iter, x_range, y_range, smooth,
+                                  max_tile_pixels, executor=pool)
+    
+    return frames
 
 def generate_bifurcation_diagram():
     """Generate bifurcation diagram for logistic map"""
@@ -124,22 +472,12 @@ def generate_bifurcation_diagram():
     r_min, r_max = 2.5, 4.0
     r_values = np.linspace(r_min, r_max, 2000)
     x0 = 0.5
+    n_keep = 100
     
-    # Store results
-    r_plot = []
-    x_plot = []
-    
-    for r in r_values:
-        # Skip transient behavior
-        x = x0
-        for _ in range(1000):
-            x = logistic_map(r, x)
-        
-        # Collect attractor points
-        for _ in range(100):
-            x = logistic_map(r, x)
-            r_plot.append(r)
-            x_plot.append(x)
+    # Skip 1000 transient iterations, then collect attractor points for all r at once
+    attractor = logistic_bifurcation_batch(r_values, x0, n_transient=1000, n_keep=n_keep)
+    r_plot = np.repeat(r_values, n_keep)
+    x_plot = attractor.ravel()
     
     plt.figure(figsize=(14, 10))
     plt.plot(r_plot, x_plot, ',k', alpha=0.5, markersize=0.1)
@@ -219,18 +557,16 @@ def generate_sensitivity_demonstration():
     x0_2 = 0.5 + 1e-6  # Tiny difference
     
     n_steps = 50
-    trajectory_1 = [x0_1]
-    trajectory_2 = [x0_2]
-    
-    x1, x2 = x0_1, x0_2
-    for _ in range(n_steps):
-        x1 = logistic_map(r, x1)
-        x2 = logistic_map(r, x2)
-        trajectory_1.append(x1)
-        trajectory_2.append(x2)
-    
-    trajectory_1 = np.array(trajectory_1)
-    trajectory_2 = np.array(trajectory_2)
+    
+    # Iterate both initial conditions in lock-step as one array
+    x = np.array([x0_1, x0_2])
+    trajectories = np.empty((n_steps + 1, 2))
+    trajectories[0] = x
+    for n in range(n_steps):
+        x = logistic_map(r, x)
+        trajectories[n + 1] = x
+    
+    trajectory_1, trajectory_2 = trajectories.T
     difference = np.abs(trajectory_1 - trajectory_2)
     
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
@@ -280,11 +616,7 @@ def generate_lyapunov_spectrum():
     print("Generating Lyapunov spectrum...")
     
     r_values = np.linspace(2.5, 4.0, 300)
-    lyapunov_values = []
-    
-    for r in r_values:
-        lyap = calculate_lyapunov_logistic(r)
-        lyapunov_values.append(lyap)
+    lyapunov_values = lyapunov_spectrum(r_values)
     
     plt.figure(figsize=(12, 8))
     plt.plot(r_values, lyapunov_values, 'b-', linewidth=1.5)
@@ -316,9 +648,10 @@ def generate_period_doubling():
     fig, axes = plt.subplots(2, 3, figsize=(16, 10))
     axes = axes.flatten()
     
-    for i, (r, label) in enumerate(zip(r_values, r_labels)):
+    trajectories = logistic_bifurcation_batch(r_values, 0.5, n_transient=500, n_keep=100)
+    
+    for i, (trajectory, label) in enumerate(zip(trajectories, r_labels)):
         if i < len(axes):
-            trajectory = iterate_logistic(r, 0.5, n_iterations=100, n_transient=500)
             
             axes[i].plot(trajectory, 'o-', markersize=4, linewidth=1, alpha=0.8)
             axes[i].set_title(label, fontsize=12)
@@ -453,22 +786,30 @@ def generate_chaos_applications():
     plt.savefig(os.path.join(image_dir, 'chaos_applications.png'), dpi=300, bbox_inches='tight')
     plt.close()
 
-def run_comprehensive_analysis():
-    """Run all chaos theory visualizations"""
+def figure_targets():
+    """Figure build targets of this module (see figure_build.py)"""
+    return [
+        figure_target(generate_bifurcation_diagram, [os.path.join(image_dir, 'bifurcation_diagram.png')]),
+        figure_target(generate_lorenz_visualization, [os.path.join(image_dir, 'lorenz_attractor.png')]),
+        figure_target(generate_sensitivity_demonstration, [os.path.join(image_dir, 'sensitivity_demonstration.png')]),
+        figure_target(generate_lyapunov_spectrum, [os.path.join(image_dir, 'lyapunov_spectrum.png')]),
+        figure_target(generate_period_doubling, [os.path.join(image_dir, 'period_doubling.png')]),
+        figure_target(generate_julia_set_visualization, [os.path.join(image_dir, 'julia_sets.png')]),
+        figure_target(generate_phase_space_comparison, [os.path.join(image_dir, 'phase_space_comparison.png')]),
+        figure_target(generate_chaos_applications, [os.path.join(image_dir, 'chaos_applications.png')]),
+    ]
+
+def run_comprehensive_analysis(force=False, dry_run=False):
+    """Run all chaos theory visualizations (figures with unchanged inputs are skipped unless force)"""
     print("=" * 60)
     print("DETERMINISTIC CHAOS - COMPREHENSIVE ANALYSIS")
     print("=" * 60)
     
     try:
-        # Generate all visualizations
-        generate_bifurcation_diagram()
-        generate_lorenz_visualization()
-        generate_sensitivity_demonstration()
-        generate_lyapunov_spectrum()
-        generate_period_doubling()
-        generate_julia_set_visualization()
-        generate_phase_space_comparison()
-        generate_chaos_applications()
+        # Generate all out-of-date visualizations
+        build_figures(figure_targets(), force=force, dry_run=dry_run)
+        if dry_run:
+            return
         
         print("\n" + "=" * 60)
         print("ALL VISUALIZATIONS GENERATED SUCCESSFULLY!")
@@ -23,6 +23,9 @@ import os
 import warnings
 warnings.filterwarnings('ignore')
 
+from chaos_analysis import logistic_map, lorenz_system, generate_lorenz_attractor
+from recurrence_analysis import recurrence_matrix
+
 # Set up paths for saving figures
 script_dir = os.path.dirname(os.path.abspath(__file__))
 repo_root = os.path.dirname(script_dir)
@@ -45,27 +48,29 @@ def butterfly_effect_quantitative():
     initial_separations = [1e-3, 1e-6, 1e-9, 1e-12]
     colors = ['red', 'blue', 'green', 'purple']
     
+    # Reference trajectory plus one perturbed member per separation, iterated in lock-step
+    n_steps = 40
+    x = 0.5 + np.concatenate(([0.0], initial_separations))
+    ensemble = np.empty((n_steps, x.size))
+    ensemble[0] = x
+    for n in range(1, n_steps):
+        x = logistic_map(r, x)
+        ensemble[n] = x
+    all_separations = np.abs(ensemble[:, 1:] - ensemble[:, :1])
+    
+    # Theoretical Lyapunov exponent for r=3.9
+    lyap_theoretical = np.log(3.9) - np.log(4)  # Approximate
+    
     for i, (delta0, color) in enumerate(zip(initial_separations, colors)):
         ax = axes[i//2, i%2]
         
-        # Two trajectories with tiny difference
-        x1, x2 = 0.5, 0.5 + delta0
-        separations = [delta0]
-        iterations = [0]
-        
-        # Theoretical Lyapunov exponent for r=3.9
-        lyap_theoretical = np.log(3.9) - np.log(4)  # Approximate
-        
-        for n in range(1, 40):
-            x1 = r * x1 * (1 - x1)
-            x2 = r * x2 * (1 - x2)
-            separation = abs(x2 - x1)
-            
-            if separation > 1e-15:  # Avoid numerical issues
-                separations.append(separation)
-                iterations.append(n)
-            else:
-                break
+        # Keep the separation up to the first step where it vanishes numerically
+        lane = all_separations[:, i]
+        lane[0] = delta0
+        vanished = np.nonzero(lane[1:] <= 1e-15)[0]
+        n_valid = vanished[0] + 1 if vanished.size else n_steps
+        separations = list(lane[:n_valid])
+        iterations = list(range(n_valid))
         
         # Plot actual separation
         ax.semilogy(iterations, separations, 'o-', color=color, linewidth=2, 
@@ -217,78 +222,126 @@ def feigenbaum_sequence():
     plt.savefig(os.path.join(image_dir, 'feigenbaum_sequence.png'), dpi=300, bbox_inches='tight')
     plt.close()
 
+# Affine maps (x, y) -> (a*x + b*y + e, c*x + d*y + f) stored as [[a, b, e], [c, d, f]]
+SIERPINSKI_MAPS = [
+    [[0.5, 0.0, 0.0], [0.0, 0.5, 0.0]],
+    [[0.5, 0.0, 0.5], [0.0, 0.5, 0.0]],
+    [[0.5, 0.0, 0.25], [0.0, 0.5, np.sqrt(3)/4]],
+]
+SIERPINSKI_PROBABILITIES = [1/3, 1/3, 1/3]
+
+# z -> (1+i)z/2 and z -> 1 + (i-1)z/2 written as real affine maps
+DRAGON_MAPS = [
+    [[0.5, -0.5, 0.0], [0.5, 0.5, 0.0]],
+    [[-0.5, -0.5, 1.0], [0.5, -0.5, 0.0]],
+]
+DRAGON_PROBABILITIES = [0.5, 0.5]
+
+# Stem, successively smaller leaflets, left leaflet, right leaflet
+BARNSLEY_FERN_MAPS = [
+    [[0.0, 0.0, 0.0], [0.0, 0.16, 0.0]],
+    [[0.85, 0.04, 0.0], [-0.04, 0.85, 1.6]],
+    [[0.2, -0.26, 0.0], [0.23, 0.22, 1.6]],
+    [[-0.15, 0.28, 0.0], [0.26, 0.24, 0.44]],
+]
+BARNSLEY_FERN_PROBABILITIES = [0.01, 0.85, 0.07, 0.07]
+
+def ifs_steps(maps, probabilities, n_steps, n_chains=1000, n_transient=50, rng=None,
+              max_block=1 << 22):
+    """Run many independent chaos-game chains of an iterated function system in lock-step.
+
+    Map choices are drawn in blocks of up to ``max_block`` at once and all
+    chains are advanced together as arrays. Yields the (x, y) arrays of
+    every step after the first ``n_transient`` steps.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    maps = np.asarray(maps, dtype=float)
+    probabilities = np.asarray(probabilities, dtype=float)
+    probabilities = probabilities / probabilities.sum()
+    a, b, e = maps[:, 0, 0], maps[:, 0, 1], maps[:, 0, 2]
+    c, d, f = maps[:, 1, 0], maps[:, 1, 1], maps[:, 1, 2]
+    
+    x = np.zeros(n_chains)
+    y = np.zeros(n_chains)
+    total_steps = n_transient + n_steps
+    steps_per_block = max(1, max_block // n_chains)
+    
+    for block_start in range(0, total_steps, steps_per_block):
+        block_steps = min(steps_per_block, total_steps - block_start)
+        choices = rng.choice(len(maps), size=(block_steps, n_chains), p=probabilities)
+        for step, k in enumerate(choices):
+            x, y = a[k]*x + b[k]*y + e[k], c[k]*x + d[k]*y + f[k]
+            if block_start + step >= n_transient:
+                yield x, y
+
+def ifs_points(maps, probabilities, n_points, n_chains=1000, n_transient=50, rng=None):
+    """Generate n_points of an IFS attractor as an (n_points, 2) array"""
+    n_steps = -(-n_points // n_chains)
+    points = np.empty((n_steps, n_chains, 2))
+    for i, (x, y) in enumerate(ifs_steps(maps, probabilities, n_steps, n_chains, n_transient, rng)):
+        points[i, :, 0] = x
+        points[i, :, 1] = y
+    return points.reshape(-1, 2)[:n_points]
+
+def ifs_density(maps, probabilities, n_points, bins=(1000, 1000), extent=None, n_chains=10000,
+                n_transient=50, rng=None, max_block=1 << 22):
+    """Accumulate n_points of an IFS attractor into a 2D histogram without storing the points.
+
+    ``extent`` is (x_min, x_max, y_min, y_max); if omitted it is estimated
+    from a short pilot run. Returns ``(density, extent)`` with density of
+    shape (ny, nx), ready for ``imshow(..., origin='lower', extent=extent)``.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    nx, ny = bins
+    if extent is None:
+        pilot = ifs_points(maps, probabilities, 20000, n_chains=1000, n_transient=n_transient, rng=rng)
+        x_min, y_min = pilot.min(axis=0)
+        x_max, y_max = pilot.max(axis=0)
+        x_pad, y_pad = 0.02 * (x_max - x_min), 0.02 * (y_max - y_min)
+        extent = (x_min - x_pad, x_max + x_pad, y_min - y_pad, y_max + y_pad)
+    x_min, x_max, y_min, y_max = extent
+    x_scale = nx / (x_max - x_min)
+    y_scale = ny / (y_max - y_min)
+    
+    density = np.zeros(nx * ny, dtype=np.int64)
+    pending = []
+    n_pending = 0
+    
+    def flush():
+        if pending:
+            density[:] += np.bincount(np.concatenate(pending), minlength=nx * ny)
+            pending.clear()
+    
+    n_steps = -(-n_points // n_chains)
+    for x, y in ifs_steps(maps, probabilities, n_steps, n_chains, n_transient, rng, max_block):
+        ix = ((x - x_min) * x_scale).astype(np.int64)
+        iy = ((y - y_min) * y_scale).astype(np.int64)
+        inside = (ix >= 0) & (ix < nx) & (iy >= 0) & (iy < ny)
+        pending.append(iy[inside] * nx + ix[inside])
+        n_pending += n_chains
+        # Bin the collected indices in large batches rather than once per step
+        if n_pending >= max_block:
+            flush()
+            n_pending = 0
+    flush()
+    
+    return density.reshape(ny, nx), extent
+
 def chaos_game_fractals():
     """Generate fractals using the chaos game"""
     print("Generating chaos game fractals...")
     
     def sierpinski_triangle():
         """Generate Sierpinski triangle using chaos game"""
-        # Triangle vertices
-        vertices = np.array([[0, 0], [1, 0], [0.5, np.sqrt(3)/2]])
-        
-        # Starting point
-        point = np.array([0.5, 0.25])
-        points = [point.copy()]
-        
-        # Chaos game iterations
-        for _ in range(10000):
-            # Choose random vertex
-            vertex_idx = np.random.randint(0, 3)
-            vertex = vertices[vertex_idx]
-            
-            # Move halfway to chosen vertex
-            point = (point + vertex) / 2
-            points.append(point.copy())
-        
-        return np.array(points)
+        return ifs_points(SIERPINSKI_MAPS, SIERPINSKI_PROBABILITIES, 10000)
     
     def dragon_curve_game():
         """Generate dragon curve using chaos game"""
-        # Complex plane approach
-        points = []
-        z = 0 + 0j
-        
-        for _ in range(15000):
-            if np.random.random() < 0.5:
-                # Transformation 1: z -> (1+i)*z/2
-                z = (1 + 1j) * z / 2
-            else:
-                # Transformation 2: z -> 1 + (i-1)*z/2
-                z = 1 + (1j - 1) * z / 2
-            
-            points.append([z.real, z.imag])
-        
-        return np.array(points)
+        return ifs_points(DRAGON_MAPS, DRAGON_PROBABILITIES, 15000)
     
     def barnsley_fern():
         """Generate Barnsley fern using chaos game"""
-        points = []
-        x, y = 0, 0
-        
-        for _ in range(50000):
-            r = np.random.random()
-            
-            if r < 0.01:
-                # Stem
-                x_new = 0
-                y_new = 0.16 * y
-            elif r < 0.86:
-                # Successively smaller leaflets
-                x_new = 0.85 * x + 0.04 * y
-                y_new = -0.04 * x + 0.85 * y + 1.6
-            elif r < 0.93:
-                # Left leaflet
-                x_new = 0.2 * x - 0.26 * y
-                y_new = 0.23 * x + 0.22 * y + 1.6
-            else:
-                # Right leaflet
-                x_new = -0.15 * x + 0.28 * y
-                y_new = 0.26 * x + 0.24 * y + 0.44
-            
-            x, y = x_new, y_new
-            points.append([x, y])
-        
-        return np.array(points)
+        return ifs_points(BARNSLEY_FERN_MAPS, BARNSLEY_FERN_PROBABILITIES, 50000)
     
     fig, axes = plt.subplots(1, 3, figsize=(18, 6))
     
@@ -378,18 +431,6 @@ def recurrence_plots():
     """Generate recurrence plots for chaotic systems"""
     print("Generating recurrence plots...")
     
-    def recurrence_matrix(trajectory, threshold):
-        """Calculate recurrence matrix"""
-        n = len(trajectory)
-        R = np.zeros((n, n))
-        
-        for i in range(n):
-            for j in range(n):
-                if abs(trajectory[i] - trajectory[j]) < threshold:
-                    R[i, j] = 1
-        
-        return R
-    
     fig, axes = plt.subplots(2, 2, figsize=(16, 12))
     
     # Different systems
@@ -420,7 +461,7 @@ def recurrence_plots():
         
         # Calculate recurrence matrix
         threshold = 0.1 * np.std(trajectory)
-        R = recurrence_matrix(trajectory, threshold)
+        R = recurrence_matrix(trajectory, threshold, output='dense')
         
         # Plot recurrence plot
         ax.imshow(R, cmap='binary', origin='lower')
@@ -437,22 +478,6 @@ def chaos_synchronization():
     """Demonstrate synchronization of chaotic systems"""
     print("Generating chaos synchronization...")
     
-    def lorenz_system(state, t, sigma=10.0, rho=28.0, beta=8.0/3.0):
-        """Lorenz system equations"""
-        x, y, z = state
-        dx_dt = sigma * (y - x)
-        dy_dt = x * (rho - z) - y
-        dz_dt = x * y - beta * z
-        return np.array([dx_dt, dy_dt, dz_dt])
-    
-    def runge_kutta_4th(func, state, t, dt, *args):
-        """4th order Runge-Kutta integration"""
-        k1 = func(state, t, *args)
-        k2 = func(state + 0.5*dt*k1, t + 0.5*dt, *args)
-        k3 = func(state + 0.5*dt*k2, t + 0.5*dt, *args)
-        k4 = func(state + dt*k3, t + dt, *args)
-        return state + (dt/6.0) * (k1 + 2*k2 + 2*k3 + k4)
-    
     fig, axes = plt.subplots(2, 2, figsize=(16, 12))
     
     # Two Lorenz systems with different initial conditions
@@ -464,30 +489,30 @@ def chaos_synchronization():
     coupling_start = 2500  # Start coupling halfway through
     coupling_strength = 2.0
     
-    t_series = []
-    x1_series = []
-    x2_series = []
-    sync_error = []
+    # Evolution without coupling, integrated straight into trajectory buffers
+    trajectory1 = generate_lorenz_attractor(state1, dt, coupling_start + 1)
+    trajectory2 = generate_lorenz_attractor(state2, dt, coupling_start + 1)
+    state1 = trajectory1[-1].copy()
+    state2 = trajectory2[-1].copy()
     
-    for i in range(n_steps):
+    t_series = list(np.arange(coupling_start) * dt)
+    x1_series = list(trajectory1[:-1, 0])
+    x2_series = list(trajectory2[:-1, 0])
+    sync_error = list(np.abs(trajectory1[:-1, 0] - trajectory2[:-1, 0]))
+    
+    for i in range(coupling_start, n_steps):
         t = i * dt
         t_series.append(t)
         x1_series.append(state1[0])
         x2_series.append(state2[0])
         sync_error.append(abs(state1[0] - state2[0]))
         
-        # Evolution without coupling
-        if i < coupling_start:
-            state1 = runge_kutta_4th(lorenz_system, state1, t, dt)
-            state2 = runge_kutta_4th(lorenz_system, state2, t, dt)
-        else:
-            # Evolution with coupling
-            # Couple through x-variable
-            dx1_coupled = lorenz_system(state1, t) + coupling_strength * (state2[0] - state1[0]) * np.array([1, 0, 0])
-            dx2_coupled = lorenz_system(state2, t) + coupling_strength * (state1[0] - state2[0]) * np.array([1, 0, 0])
-            
-            state1 += dx1_coupled * dt
-            state2 += dx2_coupled * dt
+        # Evolution with coupling through the x-variable
+        dx1_coupled = lorenz_system(state1, t) + coupling_strength * (state2[0] - state1[0]) * np.array([1, 0, 0])
+        dx2_coupled = lorenz_system(state2, t) + coupling_strength * (state1[0] - state2[0]) * np.array([1, 0, 0])
+        
+        state1 += dx1_coupled * dt
+        state2 += dx2_coupled * dt
     
     # Plot time series
     axes[0,0].plot(t_series, x1_series, 'b-', linewidth=1, label='System 1', alpha=0.8)
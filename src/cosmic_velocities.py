@@ -1,9 +1,8 @@
 import numpy as np
 import matplotlib.pyplot as plt
 import os
-import imageio
-import tempfile
 from mpl_toolkits.mplot3d import Axes3D
+from frame_sink import figure_frame_sink
 
 # Get the correct path to the images directory
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -242,150 +241,129 @@ def run_comprehensive_analysis():
     plt.close()
 
 def create_trajectory_animation():
-    with tempfile.TemporaryDirectory() as tmpdirname:
-        fig, ax = plt.subplots(figsize=(10, 10))
-        
-        n_frames = 100
-        frames_filenames = []
-        
-        planet = plt.scatter([], [], s=200, color='blue', label='Planet')
-        orbital_trajectory = plt.Line2D([], [], color='green', lw=2, label='Orbital Trajectory (First Cosmic Velocity)')
-        escape_trajectory = plt.Line2D([], [], color='red', lw=2, label='Escape Trajectory (Second Cosmic Velocity)')
-        
+    fig, ax = plt.subplots(figsize=(10, 10))
+    
+    n_frames = 100
+    
+    planet = plt.scatter([], [], s=200, color='blue', label='Planet')
+    orbital_trajectory = plt.Line2D([], [], color='green', lw=2, label='Orbital Trajectory (First Cosmic Velocity)')
+    escape_trajectory = plt.Line2D([], [], color='red', lw=2, label='Escape Trajectory (Second Cosmic Velocity)')
+    
+    # Static elements are drawn once; only the two moving markers change per frame
+    ax.scatter(0, 0, s=200, color='blue')
+    
+    theta = np.linspace(0, 2*np.pi, 100)
+    orbit_radius = 1.0
+    x_orbit = orbit_radius * np.cos(theta)
+    y_orbit = orbit_radius * np.sin(theta)
+    ax.plot(x_orbit, y_orbit, 'g--', alpha=0.5)
+    
+    escape_radius = np.linspace(0, 3, 100)
+    x_escape = escape_radius * np.cos(np.pi/4)
+    y_escape = escape_radius * np.sin(np.pi/4)
+    ax.plot(x_escape, y_escape, 'r--', alpha=0.5)
+    
+    orbital_marker = ax.scatter([orbit_radius], [0], color='green', s=50, zorder=10)
+    escape_marker = ax.scatter([0], [0], color='red', s=50, zorder=10)
+    
+    ax.set_xlim(-3, 3)
+    ax.set_ylim(-3, 3)
+    ax.set_aspect('equal')
+    ax.grid(True, linestyle='--', alpha=0.7)
+    ax.set_xlabel('Distance (arbitrary units)', fontsize=12)
+    ax.set_ylabel('Distance (arbitrary units)', fontsize=12)
+    ax.set_title('Orbital vs. Escape Trajectories', fontsize=14)
+    
+    ax.legend(handles=[planet, orbital_trajectory, escape_trajectory], 
+             loc='upper right', bbox_to_anchor=(1.0, 1.0), framealpha=0.9)
+    
+    ax.text(0.02, 0.06, 'First Cosmic Velocity: Orbital motion (circular path)', 
+            transform=ax.transAxes, fontsize=10, verticalalignment='bottom',
+            bbox=dict(facecolor='white', alpha=0.9))
+    ax.text(0.02, 0.01, 'Second Cosmic Velocity: Escape trajectory (hyperbolic path)', 
+            transform=ax.transAxes, fontsize=10, verticalalignment='bottom',
+            bbox=dict(facecolor='white', alpha=0.9))
+    
+    with figure_frame_sink(os.path.join(image_dir, 'trajectory_comparison.gif'), fig, dpi=100) as write_frame:
         for i in range(n_frames):
-            ax.clear()
-            
             t = i * 0.1
             
-            ax.scatter(0, 0, s=200, color='blue')
-            
-            theta = np.linspace(0, 2*np.pi, 100)
-            orbit_radius = 1.0
-            x_orbit = orbit_radius * np.cos(theta)
-            y_orbit = orbit_radius * np.sin(theta)
-            ax.plot(x_orbit, y_orbit, 'g--', alpha=0.5)
-            
             angle = 2 * np.pi * i / n_frames
-            x_orbital = orbit_radius * np.cos(angle)
-            y_orbital = orbit_radius * np.sin(angle)
-            
-            ax.scatter(x_orbital, y_orbital, color='green', s=50, zorder=10)
-            
-            escape_radius = np.linspace(0, 3, 100)
-            x_escape = escape_radius * np.cos(np.pi/4)
-            y_escape = escape_radius * np.sin(np.pi/4)
-            ax.plot(x_escape, y_escape, 'r--', alpha=0.5)
+            orbital_marker.set_offsets([[orbit_radius * np.cos(angle), orbit_radius * np.sin(angle)]])
             
             escape_position = min(t, 3) 
-            x_escape_current = escape_position * np.cos(np.pi/4)
-            y_escape_current = escape_position * np.sin(np.pi/4)
-            
-            ax.scatter(x_escape_current, y_escape_current, color='red', s=50, zorder=10)
-            
-            ax.set_xlim(-3, 3)
-            ax.set_ylim(-3, 3)
-            ax.set_aspect('equal')
-            ax.grid(True, linestyle='--', alpha=0.7)
-            ax.set_xlabel('Distance (arbitrary units)', fontsize=12)
-            ax.set_ylabel('Distance (arbitrary units)', fontsize=12)
-            ax.set_title('Orbital vs. Escape Trajectories', fontsize=14)
-            
-            ax.legend(handles=[planet, orbital_trajectory, escape_trajectory], 
-                     loc='upper right', bbox_to_anchor=(1.0, 1.0), framealpha=0.9)
-            
-            ax.text(0.02, 0.06, 'First Cosmic Velocity: Orbital motion (circular path)', 
-                    transform=ax.transAxes, fontsize=10, verticalalignment='bottom',
-                    bbox=dict(facecolor='white', alpha=0.9))
-            ax.text(0.02, 0.01, 'Second Cosmic Velocity: Escape trajectory (hyperbolic path)', 
-                    transform=ax.transAxes, fontsize=10, verticalalignment='bottom',
-                    bbox=dict(facecolor='white', alpha=0.9))
+            escape_marker.set_offsets([[escape_position * np.cos(np.pi/4), escape_position * np.sin(np.pi/4)]])
             
-            frame_filename = os.path.join(tmpdirname, f'frame_{i:03d}.png')
-            plt.savefig(frame_filename, dpi=100, bbox_inches='tight')
-            frames_filenames.append(frame_filename)
-        
-        with imageio.get_writer(os.path.join(image_dir, 'trajectory_comparison.gif'), mode='I', duration=0.1, loop=0) as writer:
-            for frame_filename in frames_filenames:
-                image = imageio.imread(frame_filename)
-                writer.append_data(image)
-        
-        plt.savefig(os.path.join(image_dir, 'trajectory_comparison.png'), dpi=300, bbox_inches='tight')
+            write_frame()
+    
+    plt.savefig(os.path.join(image_dir, 'trajectory_comparison.png'), dpi=300, bbox_inches='tight')
 
 def create_solar_system_escape_animation():
-    with tempfile.TemporaryDirectory() as tmpdirname:
-        fig = plt.figure(figsize=(12, 10))
-        ax = fig.add_subplot(111, projection='3d')
-        
-        n_frames = 100
-        frames_filenames = []
-        
-        sun_pos = np.array([0, 0, 0])
-        
-        earth_orbit_radius = 1.0
-        theta = np.linspace(0, 2*np.pi, 100)
-        earth_orbit_x = earth_orbit_radius * np.cos(theta)
-        earth_orbit_y = earth_orbit_radius * np.sin(theta)
-        earth_orbit_z = np.zeros_like(theta)
-        
-        spacecraft_start = np.array([earth_orbit_radius, 0, 0])
-        spacecraft_direction = np.array([1, 1, 1])
-        spacecraft_direction = spacecraft_direction / np.linalg.norm(spacecraft_direction)  # Normalize
-        spacecraft_traj_length = 3.0
-        spacecraft_traj = np.array([spacecraft_start + t * spacecraft_direction * spacecraft_traj_length 
-                                   for t in np.linspace(0, 1, n_frames)])
-        
-        elev = 30
-        azim = 45
-        
+    fig = plt.figure(figsize=(12, 10))
+    ax = fig.add_subplot(111, projection='3d')
+    
+    n_frames = 100
+    
+    sun_pos = np.array([0, 0, 0])
+    
+    earth_orbit_radius = 1.0
+    theta = np.linspace(0, 2*np.pi, 100)
+    earth_orbit_x = earth_orbit_radius * np.cos(theta)
+    earth_orbit_y = earth_orbit_radius * np.sin(theta)
+    earth_orbit_z = np.zeros_like(theta)
+    
+    spacecraft_start = np.array([earth_orbit_radius, 0, 0])
+    spacecraft_direction = np.array([1, 1, 1])
+    spacecraft_direction = spacecraft_direction / np.linalg.norm(spacecraft_direction)  # Normalize
+    spacecraft_traj_length = 3.0
+    spacecraft_traj = np.array([spacecraft_start + t * spacecraft_direction * spacecraft_traj_length 
+                               for t in np.linspace(0, 1, n_frames)])
+    
+    elev = 30
+    azim = 45
+    
+    # Static elements are drawn once; Earth, the spacecraft and its track are updated per frame
+    ax.scatter(*sun_pos, color='yellow', s=300, label='Sun')
+    ax.plot(earth_orbit_x, earth_orbit_y, earth_orbit_z, 'b--', alpha=0.5)
+    earth_marker, = ax.plot([earth_orbit_radius], [0], [0], 'o', color='blue', markersize=10, label='Earth')
+    spacecraft_marker, = ax.plot(*spacecraft_traj[0, :, np.newaxis], 'o', color='red',
+                                 markersize=np.sqrt(50), label='Spacecraft')
+    spacecraft_track, = ax.plot(*spacecraft_traj[:1].T, 'r-')
+    
+    ax.set_xlim(-3, 3)
+    ax.set_ylim(-3, 3)
+    ax.set_zlim(-3, 3)
+    
+    ax.set_xlabel('X (arbitrary units)', fontsize=12, labelpad=10)
+    ax.set_ylabel('Y (arbitrary units)', fontsize=12, labelpad=10)
+    ax.set_zlabel('Z (arbitrary units)', fontsize=12, labelpad=10)
+    
+    ax.view_init(elev=elev, azim=azim)
+    
+    ax.set_title('Solar System Escape with Third Cosmic Velocity', fontsize=14)
+    
+    ax.text2D(0.05, 0.95, 'Third Cosmic Velocity: Escape from the Solar System', 
+             transform=ax.transAxes, fontsize=12,
+             bbox=dict(facecolor='white', alpha=0.9))
+    
+    # The legend is shown on the first frame only
+    legend = ax.legend(loc='upper right', bbox_to_anchor=(1, 1), framealpha=0.9)
+    
+    with figure_frame_sink(os.path.join(image_dir, 'solar_system_escape.gif'), fig, dpi=100) as write_frame:
         for i in range(n_frames):
-            ax.clear()
-            
-            t = i / (n_frames - 1)
-            
-            ax.scatter(*sun_pos, color='yellow', s=300, label='Sun' if i == 0 else "")
-            
-            ax.plot(earth_orbit_x, earth_orbit_y, earth_orbit_z, 'b--', alpha=0.5)
-            
             earth_angle = 2 * np.pi * i / n_frames
-            earth_pos = np.array([earth_orbit_radius * np.cos(earth_angle), 
-                                 earth_orbit_radius * np.sin(earth_angle), 
-                                 0])
-            ax.scatter(*earth_pos, color='blue', s=100, label='Earth' if i == 0 else "")
-            
-            spacecraft_pos = spacecraft_traj[i]
-            ax.scatter(*spacecraft_pos, color='red', s=50, label='Spacecraft' if i == 0 else "")
-            
-            ax.plot(spacecraft_traj[:i+1, 0], spacecraft_traj[:i+1, 1], spacecraft_traj[:i+1, 2], 'r-')
+            earth_marker.set_data_3d([earth_orbit_radius * np.cos(earth_angle)],
+                                     [earth_orbit_radius * np.sin(earth_angle)], [0])
             
-            ax.set_xlim(-3, 3)
-            ax.set_ylim(-3, 3)
-            ax.set_zlim(-3, 3)
+            spacecraft_marker.set_data_3d(*spacecraft_traj[i, :, np.newaxis])
+            spacecraft_track.set_data_3d(*spacecraft_traj[:i+1].T)
             
-            ax.set_xlabel('X (arbitrary units)', fontsize=12, labelpad=10)
-            ax.set_ylabel('Y (arbitrary units)', fontsize=12, labelpad=10)
-            ax.set_zlabel('Z (arbitrary units)', fontsize=12, labelpad=10)
-            
-            ax.view_init(elev=elev, azim=azim)
-            
-            ax.set_title('Solar System Escape with Third Cosmic Velocity', fontsize=14)
-            
-            ax.text2D(0.05, 0.95, 'Third Cosmic Velocity: Escape from the Solar System', 
-                     transform=ax.transAxes, fontsize=12,
-                     bbox=dict(facecolor='white', alpha=0.9))
+            write_frame()
             
             if i == 0:
-                ax.legend(loc='upper right', bbox_to_anchor=(1, 1), framealpha=0.9)
-            
-            frame_filename = os.path.join(tmpdirname, f'frame_{i:03d}.png')
-            plt.savefig(frame_filename, dpi=100, bbox_inches='tight')
-            frames_filenames.append(frame_filename)
-        
-        with imageio.get_writer(os.path.join(image_dir, 'solar_system_escape.gif'), mode='I', duration=0.1, loop=0) as writer:
-            for frame_filename in frames_filenames:
-                image = imageio.imread(frame_filename)
-                writer.append_data(image)
-        
-        plt.savefig(os.path.join(image_dir, 'solar_system_escape.png'), dpi=300, bbox_inches='tight')
+                legend.remove()
+    
+    plt.savefig(os.path.join(image_dir, 'solar_system_escape.png'), dpi=300, bbox_inches='tight')
 
 def plot_escape_velocity_vs_distance():
     """Plot how escape velocity varies with distance from celestial bodies"""
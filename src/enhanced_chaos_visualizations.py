@@ -23,9 +23,13 @@ from mpl_toolkits.mplot3d import Axes3D
 import matplotlib.animation as animation
 from matplotlib.patches import Circle
 import os
+import functools
 import warnings
 warnings.filterwarnings('ignore')
 
+from chaos_analysis import logistic_bifurcation_batch, escape_time, render_tiles
+from poincare_maps import stroboscopic_section
+
 # Set up paths for saving figures
 script_dir = os.path.dirname(os.path.abspath(__file__))
 repo_root = os.path.dirname(script_dir)
@@ -189,25 +193,19 @@ def fractal_dimension_demo():
     plt.savefig(os.path.join(image_dir, 'fractal_dimension_demo.png'), dpi=300, bbox_inches='tight')
     plt.close()
 
+def duffing_ensemble_rhs(states, t, params):
+    """Duffing oscillator equations for an (N, 2) ensemble; params columns are (alpha, beta, delta, gamma, omega)"""
+    alpha, beta, delta, gamma, omega = params.T
+    x, y = states[:, 0], states[:, 1]
+    derivatives = np.empty_like(states)
+    derivatives[:, 0] = y
+    derivatives[:, 1] = -delta*y - alpha*x - beta*x**3 + gamma*np.cos(omega*t)
+    return derivatives
+
 def poincare_sections():
     """Generate Poincaré sections for different systems"""
     print("Generating Poincaré sections...")
     
-    def duffing_oscillator(state, t, alpha=1.0, beta=-1.0, delta=0.3, gamma=0.5, omega=1.0):
-        """Duffing oscillator equations"""
-        x, y = state
-        dx_dt = y
-        dy_dt = -delta*y - alpha*x - beta*x**3 + gamma*np.cos(omega*t)
-        return np.array([dx_dt, dy_dt])
-    
-    def runge_kutta_4th(func, state, t, dt, *args):
-        """4th order Runge-Kutta integration"""
-        k1 = func(state, t, *args)
-        k2 = func(state + 0.5*dt*k1, t + 0.5*dt, *args)
-        k3 = func(state + 0.5*dt*k2, t + 0.5*dt, *args)
-        k4 = func(state + dt*k3, t + dt, *args)
-        return state + (dt/6.0) * (k1 + 2*k2 + 2*k3 + k4)
-    
     fig, axes = plt.subplots(1, 3, figsize=(18, 6))
     
     # Different parameter sets for Duffing oscillator
@@ -216,36 +214,20 @@ def poincare_sections():
         (1.0, -1.0, 0.3, 1.14, 1.0, 'Period-2'),
         (1.0, -1.0, 0.3, 1.4, 1.0, 'Chaotic')
     ]
-    
-    for i, (alpha, beta, delta, gamma, omega, label) in enumerate(params):
-        # Initial condition
-        state = np.array([0.1, 0.1])
-        dt = 0.01
-        t = 0
-        
-        # Collect Poincaré section points (when t = 2πn/ω)
-        poincare_x = []
-        poincare_y = []
-        
-        # Run for many periods
-        period = 2 * np.pi / omega
-        n_periods = 200
-        steps_per_period = int(period / dt)
-        
-        # Skip transients
-        for _ in range(100 * steps_per_period):
-            state = runge_kutta_4th(duffing_oscillator, state, t, dt, alpha, beta, delta, gamma, omega)
-            t += dt
-        
-        # Collect Poincaré points
-        for period_num in range(n_periods):
-            for _ in range(steps_per_period):
-                state = runge_kutta_4th(duffing_oscillator, state, t, dt, alpha, beta, delta, gamma, omega)
-                t += dt
-            
-            # Store point at end of period
-            poincare_x.append(state[0])
-            poincare_y.append(state[1])
+    labels = [p[-1] for p in params]
+    param_table = np.array([p[:-1] for p in params])
+    
+    # All parameter sets share the drive frequency, so they run as one ensemble
+    # sampled exactly once per period (when t = 2πn/ω) after 100 transient periods
+    omega = param_table[0, 4]
+    initial_states = np.tile([0.1, 0.1], (len(params), 1))
+    section = stroboscopic_section(duffing_ensemble_rhs, initial_states, param_table,
+                                   period=2 * np.pi / omega, n_periods=200, n_transient=100,
+                                   steps_per_period=200)
+    
+    for i, label in enumerate(labels):
+        poincare_x = section[:, i, 0]
+        poincare_y = section[:, i, 1]
         
         axes[i].plot(poincare_x, poincare_y, 'bo', markersize=1, alpha=0.7)
         axes[i].set_xlabel('Position x', fontsize=12)
@@ -258,50 +240,75 @@ def poincare_sections():
     plt.savefig(os.path.join(image_dir, 'poincare_sections.png'), dpi=300, bbox_inches='tight')
     plt.close()
 
+def polynomial_and_derivative(coefficients, z):
+    """Evaluate a polynomial and its derivative together with Horner's scheme"""
+    p = coefficients[0]*z + coefficients[1]
+    dp = np.full_like(z, coefficients[0])
+    for a in coefficients[2:]:
+        dp *= z
+        dp += p
+        p *= z
+        p += a
+    return p, dp
+
+def newton_tile(Z, coefficients, roots, max_iter=50, tolerance=1e-6):
+    """Root label (0 = not converged) and iterations to convergence for one tile of starting points"""
+    tolerance2 = tolerance**2
+    
+    def newton_step(z, index):
+        p, dp = polynomial_and_derivative(coefficients, z)
+        # Avoid division by zero
+        dp[dp.real*dp.real + dp.imag*dp.imag < 1e-30] = 1e-15
+        return z - p / dp
+    
+    def converged(z):
+        near_root = np.zeros(z.shape, dtype=bool)
+        d = np.empty_like(z)
+        for root in roots:
+            np.subtract(z, root, out=d)
+            near_root |= d.real*d.real + d.imag*d.imag < tolerance2
+        return near_root
+    
+    # Converged pixels are retired from the active set as soon as they reach a root
+    counts, z_final = escape_time(Z, newton_step, converged, max_iter)
+    
+    nearest = np.argmin(np.abs(z_final[:, np.newaxis] - roots[np.newaxis, :]), axis=1)
+    labels = np.where(counts < max_iter, nearest + 1, 0)
+    return np.stack([labels, counts], axis=-1).reshape(Z.shape + (2,))
+
+def newton_fractal(coefficients, x_range, y_range, resolution=400, max_iter=50, tolerance=1e-6,
+                   n_workers=1, return_iterations=False, roots=None):
+    """Generate Newton fractal for a polynomial given by its coefficients (highest degree first).
+
+    Each pixel is labelled with the index (1-based) of the root it
+    converges to in ``roots``, or 0; pass ``roots`` to fix the label order
+    (default: ``np.roots(coefficients)``, computed once). With
+    ``return_iterations`` the number of Newton steps to convergence is
+    returned as well, e.g. for shading. ``n_workers`` renders the tiles in
+    a process pool.
+    """
+    coefficients = np.asarray(coefficients, dtype=complex)
+    roots = np.roots(coefficients) if roots is None else np.asarray(roots, dtype=complex)
+    tile_func = functools.partial(newton_tile, coefficients=coefficients, roots=roots,
+                                  max_iter=max_iter, tolerance=tolerance)
+    result = render_tiles(tile_func, x_range, y_range, resolution, resolution,
+                          dtype=int, n_workers=n_workers, channels=2)
+    labels, iterations = result[..., 0], result[..., 1]
+    
+    if return_iterations:
+        return labels, iterations
+    return labels
+
 def basin_of_attraction():
     """Visualize basin of attraction for a chaotic system"""
     print("Generating basin of attraction...")
     
-    def newton_fractal(f, df, roots, x_range, y_range, resolution=400, max_iter=50, tolerance=1e-6):
-        """Generate Newton fractal for complex function"""
-        x = np.linspace(x_range[0], x_range[1], resolution)
-        y = np.linspace(y_range[0], y_range[1], resolution)
-        X, Y = np.meshgrid(x, y)
-        Z = X + 1j*Y
-        
-        # Initialize result array
-        result = np.zeros(Z.shape, dtype=int)
-        
-        for i in range(max_iter):
-            # Newton's method iteration
-            mask = np.abs(f(Z)) > tolerance
-            if not np.any(mask):
-                break
-            
-            dZ = df(Z[mask])
-            # Avoid division by zero
-            dZ[np.abs(dZ) < 1e-15] = 1e-15
-            Z[mask] = Z[mask] - f(Z[mask]) / dZ
-            
-            # Check which root each point is converging to
-            for j, root in enumerate(roots):
-                root_mask = mask & (np.abs(Z - root) < tolerance)
-                result[root_mask] = j + 1
-        
-        return result
-    
-    # Define polynomial and its derivative: z^3 - 1 = 0
-    def f(z):
-        return z**3 - 1
-    
-    def df(z):
-        return 3*z**2
-    
-    # Roots of z^3 - 1 = 0
-    roots = [1, -0.5 + 0.5j*np.sqrt(3), -0.5 - 0.5j*np.sqrt(3)]
+    # Coefficients of z^3 - 1 = 0 and its roots, in the order used for the basin labels
+    coefficients = [1, 0, 0, -1]
+    roots = np.array([1, -0.5 + 0.5j*np.sqrt(3), -0.5 - 0.5j*np.sqrt(3)])
     
     # Generate fractal
-    fractal = newton_fractal(f, df, roots, (-2, 2), (-2, 2), resolution=600)
+    fractal = newton_fractal(coefficients, (-2, 2), (-2, 2), resolution=600, roots=roots)
     
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
     
@@ -318,7 +325,7 @@ def basin_of_attraction():
     ax1.legend()
     
     # Zoom in on fractal boundary
-    fractal_zoom = newton_fractal(f, df, roots, (-0.5, 0.5), (-0.5, 0.5), resolution=600)
+    fractal_zoom = newton_fractal(coefficients, (-0.5, 0.5), (-0.5, 0.5), resolution=600, roots=roots)
     im2 = ax2.imshow(fractal_zoom, extent=[-0.5, 0.5, -0.5, 0.5], cmap='viridis', origin='lower')
     ax2.set_xlabel('Real', fontsize=12)
     ax2.set_ylabel('Imaginary', fontsize=12)
@@ -394,22 +401,12 @@ def route_to_chaos_detailed():
     # Period-doubling route (logistic map)
     r_values = [2.9, 3.1, 3.45, 3.54, 3.56, 3.57, 3.6, 3.8, 4.0]
     
-    for i, r in enumerate(r_values):
+    # Skip transients and collect all trajectories in one batch
+    trajectories = logistic_bifurcation_batch(r_values, 0.5, n_transient=500, n_keep=100)
+    
+    for i, (r, trajectory) in enumerate(zip(r_values, trajectories)):
         ax = axes[i//3, i%3]
         
-        # Generate trajectory
-        x = 0.5
-        trajectory = []
-        
-        # Skip transients
-        for _ in range(500):
-            x = r * x * (1 - x)
-        
-        # Collect trajectory
-        for _ in range(100):
-            x = r * x * (1 - x)
-            trajectory.append(x)
-        
         # Plot trajectory
         ax.plot(range(len(trajectory)), trajectory, 'b-', linewidth=1)
         ax.set_title(f'r = {r}', fontsize=12)
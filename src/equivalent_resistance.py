@@ -2,6 +2,11 @@ import networkx as nx
 import numpy as np
 import matplotlib.pyplot as plt
 import os
+import itertools
+from collections import deque
+from collections.abc import Sequence
+
+from resistor_network import Netlist, netlist_labels, netlist_to_graph, nodal_equivalent_resistance
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
 repo_root = os.path.dirname(script_dir)
@@ -9,7 +14,10 @@ image_dir = os.path.join(repo_root, 'docs', '1 Physics', '5 Circuits', 'pics')
 os.makedirs(image_dir, exist_ok=True)
 
 def draw_circuit_graph(G, pos=None, title="Circuit Graph", save_path=None):
-    """Draw a circuit graph with resistor values as edge labels."""
+    """Draw a circuit graph (or Netlist) with resistor values as edge labels."""
+    if isinstance(G, Netlist):
+        G = netlist_to_graph(G)
+    
     plt.figure(figsize=(12, 8))
     
     if pos is None:
@@ -45,192 +53,319 @@ def draw_circuit_graph(G, pos=None, title="Circuit Graph", save_path=None):
     
     plt.close()
 
-def identify_series_nodes(G):
-    series_nodes = [node for node in G.nodes() if G.degree(node) == 2]
-    return series_nodes
-
-def reduce_series(G, node):
-    neighbors = list(G.neighbors(node))
-    if len(neighbors) != 2:
-        raise ValueError(f"Node {node} does not have exactly two connections")
-    
-    n1, n2 = neighbors
-    
-    r1 = G[n1][node]['resistance']
-    r2 = G[node][n2]['resistance']
+def list_triangles(neighbors):
+    """All triangles of a graph given as {node: neighbor collection}, each listed once.
     
-    r_eq = r1 + r2
-    
-    G.remove_node(node)
-    
-    G.add_edge(n1, n2, resistance=r_eq)
-    
-    return G
-
-def identify_parallel_edges(G):
+    Nodes are ranked by degree and every edge is oriented towards the
+    higher rank; a triangle is then found exactly once, as the intersection
+    of the forward neighbor sets of an oriented edge's endpoints. This takes
+    O(m^1.5) time instead of checking every pair of neighbors of every node.
     """
-    Identify pairs of nodes that have multiple edges between them (parallel resistors).
-    For regular graphs, this means checking if there are duplicate edges.
-    """
-    parallel_pairs = []
-    
-    # For MultiGraph, check for multiple edges between same nodes
-    if isinstance(G, nx.MultiGraph):
-        for u, v in G.edges():
-            if G.number_of_edges(u, v) > 1:
-                if (u, v) not in parallel_pairs and (v, u) not in parallel_pairs:
-                    parallel_pairs.append((u, v))
-    else:
-        # For regular Graph, we need to look for artificially created parallel paths
-        # This is less common but can happen in certain circuit representations
-        pass
-    
-    return parallel_pairs
+    rank = {node: k for k, node in enumerate(sorted(neighbors, key=lambda node: len(neighbors[node])))}
+    forward = {node: {other for other in neighbors[node] if rank[other] > rank[node]} for node in neighbors}
+    
+    triangles = []
+    for a in sorted(neighbors, key=rank.get):
+        for b in sorted(forward[a], key=rank.get):
+            for c in sorted(forward[a] & forward[b], key=rank.get):
+                triangles.append((a, b, c))
+    return triangles
 
-def reduce_parallel(G, node_pair):
-    """
-    Reduce parallel connections between a pair of nodes.
+def find_delta_configurations(G):
+    delta_configs = [tuple(sorted(triangle)) for triangle in list_triangles(G.adj)]
+    return sorted(delta_configs)
+
+class WorkingCircuit:
+    """Mutable circuit used by the reduction engine, built from a networkx graph or a Netlist.
+    
+    Resistors live in an edge table {edge id: (u, v, resistance)} with
+    per-node adjacency ``adjacency[node][neighbor] = {edge ids}`` and
+    degree counts, so a reduction only touches the nodes it involves.
+    Every change is also appended to ``changes``, the diff of the current step.
+    
+    The triangles (Δ configurations) are indexed as well: listed once at
+    the start, then updated whenever two nodes become connected or lose
+    their last resistor, by intersecting the two neighbor sets. New
+    triangles are also appended to ``triangle_queue`` for the engine.
+    The reductions (``reduce_series``, ``reduce_parallel`` and
+    ``delta_to_wye_transformation``) change the circuit only through
+    ``add_edge`` / ``remove_edge``, so they keep the index current.
     """
-    u, v = node_pair
     
-    # Get all resistances between the nodes
-    if isinstance(G, nx.MultiGraph):
-        # For MultiGraph, get all edges between u and v
-        edges = [data['resistance'] for key, data in G[u][v].items()]
-    else:
-        # For regular Graph, there should only be one edge, but check anyway
-        edges = []
-        for n1, n2, data in G.edges(data=True):
-            if (n1 == u and n2 == v) or (n1 == v and n2 == u):
-                edges.append(data['resistance'])
-    
-    if len(edges) <= 1:
-        return G  # No parallel edges to reduce
-    
-    # Calculate the equivalent resistance (1/R_eq = 1/R1 + 1/R2 + ...)
-    r_eq = 1.0 / sum(1.0 / r for r in edges)
-    
-    # Remove all edges between the nodes
-    if isinstance(G, nx.MultiGraph):
-        G.remove_edges_from([(u, v, key) for key in G[u][v].keys()])
-    else:
-        while G.has_edge(u, v):
-            G.remove_edge(u, v)
-    
-    # Add a new edge with the equivalent resistance
-    G.add_edge(u, v, resistance=r_eq)
-    
-    return G
+    def __init__(self, G):
+        self.adjacency = {}
+        self.degree = {}
+        self.edges = {}
+        self.next_edge = 0
+        self.has_parallel = False
+        self.changes = []
+        self.triangles = None
+        
+        if isinstance(G, Netlist):
+            labels = netlist_labels(G)
+            resistors = ((labels[a], labels[b], r) for a, b, r in
+                         zip(G.u.tolist(), G.v.tolist(), (1.0 / G.conductance).tolist()))
+        else:
+            labels, resistors = G.nodes(), G.edges(data='resistance')
+        
+        for node in labels:
+            self.add_node(node)
+        for u, v, resistance in resistors:
+            if u != v:  # A resistor shorted by a self-loop carries no current
+                self.add_edge(u, v, resistance)
+        
+        triangles = list_triangles(self.adjacency)
+        self.triangles = {frozenset(triangle) for triangle in triangles}
+        self.triangle_queue = deque(triangles)
+        
+        int_nodes = [node for node in self.adjacency if isinstance(node, (int, np.integer))]
+        self.all_int_nodes = len(int_nodes) == len(self.adjacency)
+        self.next_node = max(int_nodes, default=-1) + 1
+    
+    def add_node(self, node):
+        self.adjacency[node] = {}
+        self.degree[node] = 0
+        self.changes.append(('add_node', node))
+    
+    def new_node(self):
+        """Add a node with a fresh label (the next integer, like max(G.nodes()) + 1)"""
+        while True:
+            node = self.next_node if self.all_int_nodes else f"Y{self.next_node}"
+            self.next_node += 1
+            if node not in self.adjacency:
+                self.add_node(node)
+                return node
+    
+    def remove_node(self, node):
+        """Remove a node together with its resistors"""
+        for ids in list(self.adjacency[node].values()):
+            for edge in list(ids):
+                self.remove_edge(edge)
+        del self.adjacency[node], self.degree[node]
+        self.changes.append(('remove_node', node))
+    
+    def _common_neighbors(self, u, v):
+        small, large = sorted((self.adjacency[u], self.adjacency[v]), key=len)
+        return [w for w in small if w in large]
+    
+    def add_edge(self, u, v, resistance):
+        if v in self.adjacency[u]:
+            self.has_parallel = True
+        elif self.triangles is not None:
+            # u and v become neighbors: every common neighbor closes a triangle
+            for w in self._common_neighbors(u, v):
+                self.triangles.add(frozenset((u, v, w)))
+                self.triangle_queue.append((u, v, w))
+        edge = self.next_edge
+        self.next_edge += 1
+        self.edges[edge] = (u, v, resistance)
+        self.adjacency[u].setdefault(v, set()).add(edge)
+        self.adjacency[v].setdefault(u, set()).add(edge)
+        self.degree[u] += 1
+        self.degree[v] += 1
+        self.changes.append(('add_edge', edge, u, v, resistance))
+        return edge
+    
+    def remove_edge(self, edge):
+        u, v, resistance = self.edges.pop(edge)
+        for a, b in ((u, v), (v, u)):
+            ids = self.adjacency[a][b]
+            ids.discard(edge)
+            if not ids:
+                del self.adjacency[a][b]
+            self.degree[a] -= 1
+        if v not in self.adjacency[u] and self.triangles is not None:
+            # Last resistor between u and v: their triangles are gone
+            for w in self._common_neighbors(u, v):
+                self.triangles.discard(frozenset((u, v, w)))
+        self.changes.append(('remove_edge', edge, u, v, resistance))
+        return resistance
+    
+    def edges_between(self, u, v):
+        return sorted(self.adjacency[u].get(v, ()))
+    
+    def reduce_series(self, node):
+        """Replace the two resistors at a node by one resistor R1 + R2 between its neighbors"""
+        neighbors = list(self.adjacency[node])
+        if len(neighbors) != 2 or self.degree[node] != 2:
+            raise ValueError(f"Node {node} does not have exactly two connections")
+        
+        n1, n2 = neighbors
+        (e1,), (e2,) = self.edges_between(node, n1), self.edges_between(node, n2)
+        r_eq = self.edges[e1][2] + self.edges[e2][2]
+        self.remove_node(node)
+        self.add_edge(n1, n2, r_eq)
+        return n1, n2
+    
+    def reduce_parallel(self, u, v):
+        """Replace all resistors between u and v by one (1/R_eq = 1/R1 + 1/R2 + ...)"""
+        resistances = [self.remove_edge(edge) for edge in self.edges_between(u, v)]
+        self.add_edge(u, v, 1.0 / sum(1.0 / r for r in resistances))
+    
+    def delta_to_wye_transformation(self, a, b, c):
+        """Replace the triangle a-b-c of single resistors by a star around a new node; returns the node"""
+        pairs = [self.edges_between(a, b), self.edges_between(b, c), self.edges_between(c, a)]
+        if any(len(edges) != 1 for edges in pairs):
+            raise ValueError("The three nodes must form a triangle of single resistors")
+        r_ab, r_bc, r_ca = (self.remove_edge(edge) for (edge,) in pairs)
+        
+        denominator = r_ab + r_bc + r_ca
+        center = self.new_node()
+        self.add_edge(a, center, (r_ab * r_ca) / denominator)
+        self.add_edge(b, center, (r_ab * r_bc) / denominator)
+        self.add_edge(c, center, (r_bc * r_ca) / denominator)
+        return center
+    
+    def commit(self):
+        """Diff of the current step; starts a new one"""
+        changes, self.changes = tuple(self.changes), []
+        return changes
 
-def delta_to_wye_transformation(G, nodes):
-    if len(nodes) != 3:
-        raise ValueError("Delta to Wye transformation requires exactly three nodes")
-    
-    a, b, c = nodes
-    
-    if not (G.has_edge(a, b) and G.has_edge(b, c) and G.has_edge(c, a)):
-        raise ValueError("The three nodes must form a complete triangle")
-    
-    r_ab = G[a][b]['resistance']
-    r_bc = G[b][c]['resistance']
-    r_ca = G[c][a]['resistance']
-    
-    denominator = r_ab + r_bc + r_ca
-    r_a = (r_ab * r_ca) / denominator
-    r_b = (r_ab * r_bc) / denominator
-    r_c = (r_bc * r_ca) / denominator
-    
-    new_node = max(G.nodes()) + 1
-    
-    G.remove_edge(a, b)
-    G.remove_edge(b, c)
-    G.remove_edge(c, a)
-    
-    G.add_edge(a, new_node, resistance=r_a)
-    G.add_edge(b, new_node, resistance=r_b)
-    G.add_edge(c, new_node, resistance=r_c)
-    
-    return G
+def apply_changes(graph, changes):
+    """Replay a step diff of a WorkingCircuit on a networkx graph (MultiGraph keys are edge ids)"""
+    multigraph = graph.is_multigraph()
+    for change in changes:
+        if change[0] == 'add_node':
+            graph.add_node(change[1])
+        elif change[0] == 'remove_node':
+            graph.remove_node(change[1])
+        elif change[0] == 'add_edge':
+            _, edge, u, v, resistance = change
+            if multigraph:
+                graph.add_edge(u, v, key=edge, resistance=resistance)
+            else:
+                graph.add_edge(u, v, resistance=resistance)
+        else:
+            _, edge, u, v, _ = change
+            if multigraph:
+                graph.remove_edge(u, v, key=edge)
+            else:
+                graph.remove_edge(u, v)
 
-def find_delta_configurations(G):
-    delta_configs = []
+class ReductionSteps(Sequence):
+    """Reduction steps as a sequence of (circuit graph, description) pairs, stored as diffs.
     
-    for a in G.nodes():
-        for b in G.neighbors(a):
-            for c in G.neighbors(a):
-                if b != c and G.has_edge(b, c):
-                    triangle = tuple(sorted([a, b, c]))
-                    if triangle not in delta_configs:
-                        delta_configs.append(triangle)
+    Step 0 is the initial circuit and every later step keeps only the nodes
+    and resistors it added or removed. A step's graph is materialized when
+    it is accessed by replaying the diffs; the last materialized graph is
+    kept, so stepping through the sequence in order replays each diff once.
+    """
     
-    return delta_configs
+    def __init__(self, diffs, descriptions, graph_class):
+        self.diffs = list(diffs)
+        self.descriptions = list(descriptions)
+        self.graph_class = graph_class
+        self._materialized = (-1, graph_class())
+    
+    def __len__(self):
+        return len(self.diffs)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[k] for k in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("reduction step index out of range")
+        return self.snapshot(index), self.descriptions[index]
+    
+    def snapshot(self, index):
+        """Graph of the circuit after step ``index`` (a new copy on every call)"""
+        step, graph = self._materialized
+        if step > index:
+            step, graph = -1, self.graph_class()
+        for k in range(step + 1, index + 1):
+            apply_changes(graph, self.diffs[k])
+        self._materialized = (index, graph)
+        return graph.copy()
+
+def next_delta(circuit, excluded):
+    """Next queued triangle still in the circuit's triangle index and avoiding the excluded nodes, or None"""
+    while circuit.triangle_queue:
+        triangle = circuit.triangle_queue.popleft()
+        if frozenset(triangle) in circuit.triangles and not excluded.intersection(triangle):
+            return triangle
+    return None
 
 def calculate_equivalent_resistance(G, source, target):
-    # Handle both Graph and MultiGraph types properly
-    if isinstance(G, nx.MultiGraph):
-        H = nx.MultiGraph(G)
-    else:
-        H = nx.Graph(G)
-    
-    reduction_steps = []
-    reduction_steps.append((H.copy(), "Initial Circuit"))
-    
-    iteration = 0
-    max_iterations = 100  
-    
-    # Special case: if we already have only 2 nodes, check for parallel edges first
-    if len(H.nodes()) == 2:
-        parallel_pairs = identify_parallel_edges(H)
-        if parallel_pairs:
-            pair = parallel_pairs[0]
-            H = reduce_parallel(H, pair)
-            reduction_steps.append((H.copy(), f"Initial Parallel Reduction between Nodes {pair}"))
-    
-    while len(H.nodes()) > 2 and iteration < max_iterations:
-        iteration += 1
-        
-        series_nodes = identify_series_nodes(H)
-        
-        series_nodes = [node for node in series_nodes if node != source and node != target]
-        
-        if series_nodes:
-            node = series_nodes[0]
-            H = reduce_series(H, node)
-            reduction_steps.append((H.copy(), f"After Series Reduction at Node {node}"))
+    """Equivalent resistance between two terminals by series, parallel and Δ-Y reductions.
+    
+    ``G`` is a networkx circuit graph or a Netlist. Returns
+    ``(R_eq, reduction_steps)``, where ``reduction_steps`` is a
+    ReductionSteps sequence of (graph, description) pairs starting with the
+    initial circuit. Work queues hold the candidate series nodes and
+    parallel node pairs, and each reduction re-queues only the nodes it
+    touched, so series-parallel circuits reduce in linear time; Δ
+    configurations come from the circuit's incrementally maintained
+    triangle index. Dangling resistors carry no current and are removed.
+    Raises ValueError if the circuit cannot be reduced to a single resistor.
+    """
+    circuit = WorkingCircuit(G)
+    terminals = {source, target}
+    diffs = [circuit.commit()]
+    descriptions = ["Initial Circuit"]
+    
+    def record(description):
+        diffs.append(circuit.commit())
+        descriptions.append(description)
+    
+    def is_series_candidate(node):
+        return node in circuit.adjacency and node not in terminals and circuit.degree[node] <= 2
+    
+    series_queue = deque(node for node in circuit.adjacency if is_series_candidate(node))
+    parallel_queue = deque((u, v) for u, neighbors in circuit.adjacency.items()
+                           for v, ids in neighbors.items() if len(ids) > 1)
+    
+    def queue_touched(*nodes):
+        for node in nodes:
+            if is_series_candidate(node):
+                series_queue.append(node)
+    
+    while True:
+        if series_queue:
+            node = series_queue.popleft()
+            if not is_series_candidate(node):
+                continue
+            
+            neighbors = list(circuit.adjacency[node])
+            if len(neighbors) == 2:
+                n1, n2 = circuit.reduce_series(node)
+                if len(circuit.edges_between(n1, n2)) > 1:
+                    parallel_queue.append((n1, n2))
+                record(f"After Series Reduction at Node {node}")
+            else:
+                # Dead end: no current flows through it
+                circuit.remove_node(node)
+                queue_touched(*neighbors)
+                record(f"After Removing Dangling Node {node}")
             continue
         
-        parallel_pairs = identify_parallel_edges(H)
-        if parallel_pairs:
-            pair = parallel_pairs[0]
-            H = reduce_parallel(H, pair)
-            reduction_steps.append((H.copy(), f"After Parallel Reduction between Nodes {pair}"))
+        if parallel_queue:
+            u, v = parallel_queue.popleft()
+            if u not in circuit.adjacency or len(circuit.edges_between(u, v)) < 2:
+                continue
+            
+            circuit.reduce_parallel(u, v)
+            queue_touched(u, v)
+            prefix = "Initial" if len(descriptions) == 1 and len(circuit.adjacency) == 2 else "After"
+            record(f"{prefix} Parallel Reduction between Nodes {(u, v)}")
             continue
         
-        delta_configs = find_delta_configurations(H)
-        if delta_configs:
-            delta_configs = [config for config in delta_configs 
-                            if source not in config and target not in config]
-            
-            if delta_configs:
-                config = delta_configs[0]
-                try:
-                    H = delta_to_wye_transformation(H, config)
-                    reduction_steps.append((H.copy(), f"After Delta-Wye Transformation at Nodes {config}"))
-                    continue
-                except Exception as e:
-                    print(f"Error in delta-wye transformation: {e}")
+        config = next_delta(circuit, terminals)
+        if config is not None:
+            circuit.delta_to_wye_transformation(*config)
+            queue_touched(*config)
+            record(f"After Delta-Wye Transformation at Nodes {config}")
+            continue
         
         break
     
+    graph_class = nx.MultiGraph if isinstance(G, nx.MultiGraph) or circuit.has_parallel else nx.Graph
+    reduction_steps = ReductionSteps(diffs, descriptions, graph_class)
+    
     # Check if the reduction was successful
-    if len(H.nodes()) == 2 and H.has_edge(source, target):
-        if isinstance(H, nx.MultiGraph):
-            # For MultiGraph, get the resistance from the first (and should be only) edge
-            edge_data = list(H[source][target].values())[0]
-            equivalent_resistance = edge_data['resistance']
-        else:
-            # For regular Graph
-            equivalent_resistance = H[source][target]['resistance']
+    if set(circuit.adjacency) == terminals and len(circuit.edges) == 1:
+        (_, _, equivalent_resistance), = circuit.edges.values()
     else:
         raise ValueError("Could not reduce the circuit completely. Try using delta-wye transformations or other methods.")
     
@@ -336,15 +471,19 @@ def analyze_example_circuits():
                           title=f"Example {i+1}: {description}",
                           save_path=os.path.join(image_dir, f"example_{i+1}_circuit.png"))
         
+        # Nodal analysis works for any network; the reduction shows the steps
+        nodal_resistance = nodal_equivalent_resistance(G, source, target)
+        
         try:
             equivalent_resistance, reduction_steps = calculate_equivalent_resistance(G, source, target)
             
             print(f"  Source: Node {source}, Target: Node {target}")
             print(f"  Equivalent resistance: {equivalent_resistance:.3f}Ω")
+            print(f"  Nodal analysis check: {nodal_resistance:.3f}Ω")
             print(f"  Reduction steps: {len(reduction_steps) - 1}")
             
             # Visualize reduction steps
-            for j, (H, step_description) in enumerate(reduction_steps[1:], 1):  # Skip initial state
+            for j, (H, step_description) in enumerate(itertools.islice(reduction_steps, 1, None), 1):  # Skip initial state
                 # Try to maintain similar layout
                 step_pos = {node: pos.get(node, (0, 0)) for node in H.nodes() if node in pos}
                 if not step_pos:
@@ -360,18 +499,21 @@ def analyze_example_circuits():
                 "source": source,
                 "target": target,
                 "equivalent_resistance": equivalent_resistance,
+                "nodal_resistance": nodal_resistance,
                 "num_steps": len(reduction_steps) - 1  
             })
             
         except Exception as e:
-            print(f"  Error: {e}")
+            print(f"  Reduction failed: {e}")
+            print(f"  Equivalent resistance (nodal analysis): {nodal_resistance:.3f}Ω")
             # Still add to results for completeness
             results.append({
                 "example": i+1,
                 "description": description,
                 "source": source,
                 "target": target,
-                "equivalent_resistance": "Error",
+                "equivalent_resistance": nodal_resistance,
+                "nodal_resistance": nodal_resistance,
                 "num_steps": 0
             })
     
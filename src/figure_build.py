@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Incremental Figure Build
+========================
+
+Make-like rebuilding of the documentation figures:
+1. Each figure target names a generating function, its keyword parameters
+   and the PNG/GIF files it writes
+2. A target's dependencies are found from its code: the source of every
+   function in the same module it (transitively) references, the values of
+   simple module-level constants it uses, and the whole source file of any
+   other module in src/ it calls into
+3. A manifest (``<repo>/.cache/figure_manifest.json``) records these hashes
+   per target; targets whose record matches and whose outputs all exist
+   are skipped
+4. Records are merged into the manifest under a file lock, so modules
+   built in parallel (see figure_orchestrator.py) share one manifest
+   without overwriting each other's entries
+
+Modules list their targets in a ``figure_targets()`` function. From the
+command line:
+
+    python figure_build.py --dry-run          # list what would be rebuilt
+    python figure_build.py                    # rebuild out-of-date figures
+    python figure_build.py --force julia      # rebuild targets matching 'julia'
+
+Author: Physics Class Project
+Date: 2025
+"""
+
+import numpy as np
+import os
+import sys
+import json
+import types
+import inspect
+import hashlib
+import argparse
+import importlib
+import contextlib
+from collections import namedtuple
+
+# fcntl is POSIX only; elsewhere manifest updates are merged without a lock
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+repo_root = os.path.dirname(script_dir)
+MANIFEST_PATH = os.path.join(repo_root, '.cache', 'figure_manifest.json')
+
+# Modules whose figure_targets() are built by the command line interface
+FIGURE_MODULES = ['chaos_analysis', 'lorentz_force', 'wave_interference']
+
+FigureTarget = namedtuple('FigureTarget', ['name', 'func', 'outputs', 'params'])
+
+def figure_target(func, outputs, params=None, name=None):
+    """Target that runs ``func(**params)`` to write the given output paths"""
+    return FigureTarget(name or func.__name__, func, list(outputs), dict(params or {}))
+
+def _file_hash(path):
+    """SHA-1 of a file's contents"""
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def _is_local_module(module):
+    """True for modules of this project (files in src/)"""
+    path = getattr(module, '__file__', None)
+    return path is not None and os.path.dirname(os.path.abspath(path)) == script_dir
+
+def _unwrap(obj):
+    """Underlying Python function of decorated (functools.wraps) or numba-compiled functions"""
+    while True:
+        inner = getattr(obj, '__wrapped__', None) or getattr(obj, 'py_func', None)
+        if inner is None:
+            return obj
+        obj = inner
+
+def _code_names(code):
+    """Global names used by a code object and the functions nested in it"""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _code_names(const)
+    return names
+
+def _constant_repr(value):
+    """Stable text of a simple module-level constant, or None for anything else"""
+    if isinstance(value, (bool, int, float, complex, str, type(None))):
+        return repr(value)
+    if isinstance(value, np.ndarray) and value.size <= 10000:
+        return f'{value.dtype.str}{value.shape}{value.tolist()}'
+    if isinstance(value, (tuple, list)) and len(value) <= 1000:
+        items = [_constant_repr(item) for item in value]
+        return None if None in items else f'{type(value).__name__}[{",".join(items)}]'
+    return None
+
+def source_dependencies(func):
+    """Hashes of everything the output of ``func`` depends on, as a {key: hash} dict.
+    
+    Keys are 'function:<module>.<name>', 'constant:<module>.<name>' and
+    'file:<path relative to the repo>'.
+    """
+    dependencies = {}
+    stack = [_unwrap(func)]
+    seen = set()
+    
+    while stack:
+        func = stack.pop()
+        if id(func) in seen:
+            continue
+        seen.add(id(func))
+        
+        module_name = func.__module__
+        dependencies[f'function:{module_name}.{func.__qualname__}'] = hashlib.sha1(
+            inspect.getsource(func).encode()).hexdigest()
+        
+        for name in _code_names(func.__code__):
+            if name not in func.__globals__:
+                continue
+            value = func.__globals__[name]
+            target = _unwrap(value)
+            
+            if isinstance(value, types.ModuleType):
+                if _is_local_module(value):
+                    dependencies[f'file:{os.path.relpath(value.__file__, repo_root)}'] = _file_hash(value.__file__)
+            elif isinstance(target, (types.FunctionType, type)):
+                owner = sys.modules.get(target.__module__)
+                if owner is None or not _is_local_module(owner):
+                    continue
+                if target.__module__ == module_name and isinstance(target, types.FunctionType):
+                    stack.append(target)
+                else:
+                    dependencies[f'file:{os.path.relpath(owner.__file__, repo_root)}'] = _file_hash(owner.__file__)
+            else:
+                text = _constant_repr(value)
+                if text is not None:
+                    dependencies[f'constant:{module_name}.{name}'] = hashlib.sha1(text.encode()).hexdigest()
+    
+    return dependencies
+
+def target_record(target):
+    """Manifest record of a target: function, parameters, outputs and dependency hashes"""
+    import matplotlib
+    return {
+        'function': f'{target.func.__module__}.{target.func.__qualname__}',
+        'params': json.loads(json.dumps(target.params, default=repr)),
+        'outputs': [os.path.relpath(path, repo_root) for path in target.outputs],
+        'dependencies': source_dependencies(target.func),
+        'matplotlib': matplotlib.__version__,
+    }
+
+def load_manifest(path):
+    """Manifest dict {target name: record}; empty if there is no manifest yet"""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def save_manifest(manifest, path):
+    """Write the manifest atomically"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+@contextlib.contextmanager
+def _manifest_lock(path):
+    """Exclusive lock on ``<path>.lock`` for the duration of a read-merge-write"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + '.lock', 'a') as lock_file:
+        if HAS_FCNTL:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if HAS_FCNTL:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def update_manifest(path, name, record):
+    """Store one target's record, merged into the current manifest on disk.
+    
+    The manifest is re-read under the lock, so records written meanwhile
+    by other processes are kept.
+    """
+    with _manifest_lock(path):
+        manifest = load_manifest(path)
+        manifest[name] = record
+        save_manifest(manifest, path)
+
+def stale_reason(target, record, manifest):
+    """Why a target must be rebuilt, or None if it is up to date"""
+    previous = manifest.get(target.name)
+    if previous is None:
+        return "not built yet"
+    missing = [path for path in target.outputs if not os.path.exists(path)]
+    if missing:
+        return f"missing {os.path.basename(missing[0])}"
+    if previous.get('params') != record['params']:
+        return "parameters changed"
+    if previous.get('outputs') != record['outputs']:
+        return "outputs changed"
+    changed = sorted(key for key in set(previous.get('dependencies', {})) | set(record['dependencies'])
+                     if previous.get('dependencies', {}).get(key) != record['dependencies'].get(key))
+    if changed:
+        return f"changed {changed[0].split(':', 1)[1]}" + (f" (+{len(changed) - 1} more)" if len(changed) > 1 else "")
+    if previous.get('matplotlib') != record['matplotlib']:
+        return "matplotlib version changed"
+    return None
+
+def build_figures(targets, force=False, dry_run=False, manifest_path=None):
+    """Run the out-of-date targets (all of them with ``force``) and update the manifest.
+    
+    With ``dry_run`` nothing is run or written; the targets that would be
+    rebuilt are only listed. Returns the names of the rebuilt (or to be
+    rebuilt) targets.
+    """
+    manifest_path = manifest_path or MANIFEST_PATH
+    manifest = load_manifest(manifest_path)
+    rebuilt = []
+    
+    for target in targets:
+        record = target_record(target)
+        reason = "forced" if force else stale_reason(target, record, manifest)
+        
+        if reason is None:
+            print(f"  up to date: {target.name}")
+            continue
+        
+        rebuilt.append(target.name)
+        if dry_run:
+            print(f"  would rebuild: {target.name} ({reason})")
+            continue
+        
+        print(f"  rebuilding: {target.name} ({reason})")
+        target.func(**target.params)
+        manifest[target.name] = record
+        update_manifest(manifest_path, target.name, record)
+    
+    return rebuilt
+
+def main(argv=None):
+    """Command line interface: build (or list with --dry-run) the figure targets"""
+    parser = argparse.ArgumentParser(description="Rebuild documentation figures whose inputs changed")
+    parser.add_argument('patterns', nargs='*', help="only targets whose name contains one of these")
+    parser.add_argument('--dry-run', '-n', action='store_true', help="list what would be rebuilt")
+    parser.add_argument('--force', '-B', action='store_true', help="rebuild even if up to date")
+    parser.add_argument('--module', action='append', help=f"modules to build (default: {', '.join(FIGURE_MODULES)})")
+    args = parser.parse_args(argv)
+    
+    import matplotlib
+    matplotlib.use('Agg')
+    
+    for module_name in args.module or FIGURE_MODULES:
+        module = importlib.import_module(module_name)
+        targets = [target for target in module.figure_targets()
+                   if not args.patterns or any(pattern in target.name for pattern in args.patterns)]
+        if targets:
+            print(f"{module_name}:")
+            build_figures(targets, force=args.force, dry_run=args.dry_run)
+    
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Figure Generation Orchestrator
+==============================
+
+Rebuilds the whole documentation image set in one command:
+1. Discovers the figure scripts in src/ (modules with a ``__main__`` block
+   that save figures or animations)
+2. Runs each script's ``__main__`` block in its own worker process with the
+   Agg backend, from the repository root, with its output sent to a log file
+3. Records the repository files every script reads and writes (through an
+   audit hook in its worker) and derives the dependency graph from them:
+   a script that reads a file another script writes runs after it. Files
+   written by several scripts must be ordered by ``TASK_DEPENDENCIES``
+   (the last writer wins); unordered ones are reported
+4. Schedules the scripts as a dependency graph: a task starts once the
+   tasks it depends on have finished, longest tasks first (by the wall
+   times of the previous run) so N workers finish in about 1/N of the
+   serial time
+5. Gives every script a share of the cores for its own process pools
+   (``FIGURE_WORKERS``, read by ``parameter_sweep.default_workers``), so N
+   workers do not each start one pool process per core
+6. Reports wall time and peak resident memory of every task
+
+    python figure_orchestrator.py              # all tasks on all cores
+    python figure_orchestrator.py -j 4 chaos   # tasks whose name contains 'chaos'
+    python figure_orchestrator.py --list
+
+Author: Physics Class Project
+Date: 2025
+"""
+
+import os
+import sys
+import ast
+import json
+import time
+import runpy
+import argparse
+import traceback
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from parameter_sweep import WORKER_BUDGET_ENV
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+repo_root = os.path.dirname(script_dir)
+LOG_DIR = os.path.join(repo_root, '.cache', 'figure_logs')
+TIMINGS_PATH = os.path.join(repo_root, '.cache', 'figure_timings.json')
+FILE_ACCESS_PATH = os.path.join(repo_root, '.cache', 'figure_files.json')
+
+# Write-write orderings that cannot be derived from the recorded file access:
+# task -> tasks that must finish first. cosmic_velocities and
+# payload_trajectories both write 2 Gravity/pics/trajectory_comparison.png;
+# Problem 3 shows the payload version.
+TASK_DEPENDENCIES = {
+    'payload_trajectories': ['cosmic_velocities'],
+}
+
+# Repository directories whose files are not task inputs or outputs
+_UNTRACKED_DIRS = ('src', '.cache', '.git')
+
+def _has_main_block(tree):
+    """True if a module has a top-level ``if __name__ == "__main__":`` block"""
+    for node in tree.body:
+        if isinstance(node, ast.If) and isinstance(node.test, ast.Compare):
+            names = [n.id for n in ast.walk(node.test) if isinstance(n, ast.Name)]
+            constants = [n.value for n in ast.walk(node.test) if isinstance(n, ast.Constant)]
+            if '__name__' in names and '__main__' in constants:
+                return True
+    return False
+
+def discover_tasks(directory=script_dir):
+    """Figure scripts as {task name: path}: modules with a __main__ block that write images"""
+    tasks = {}
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith('.py') or filename == os.path.basename(__file__):
+            continue
+        path = os.path.join(directory, filename)
+        with open(path, encoding='utf-8') as f:
+            source = f.read()
+        if not any(marker in source for marker in ('savefig', '.save(', 'mimsave')):
+            continue
+        if _has_main_block(ast.parse(source)):
+            tasks[filename[:-3]] = path
+    return tasks
+
+def _peak_rss_mb():
+    """Peak resident set size of this process and its children, in MB (None if unavailable)"""
+    if resource is None:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def _repository_file(path):
+    """Path of a file relative to the repository, or None outside it or in src/, .cache/, .git/"""
+    if not isinstance(path, (str, bytes, os.PathLike)):
+        return None
+    relative = os.path.relpath(os.path.abspath(os.fsdecode(path)), repo_root)
+    if relative.startswith(os.pardir) or relative.split(os.sep, 1)[0] in _UNTRACKED_DIRS:
+        return None
+    return relative
+
+def _track_file_access(reads, writes):
+    """Install an audit hook adding every repository file this process opens to reads or writes"""
+    write_flags = os.O_WRONLY | os.O_RDWR | os.O_CREAT | os.O_APPEND
+    
+    def hook(event, args):
+        if event != 'open':
+            return
+        path, mode, flags = args
+        relative = _repository_file(path)
+        if relative is None:
+            return
+        writing = any(c in mode for c in 'wax+') if isinstance(mode, str) else bool(flags & write_flags)
+        (writes if writing else reads).add(relative)
+    
+    sys.addaudithook(hook)
+
+def _run_task(name, path, log_path, worker_budget):
+    """Worker: run one script as __main__ with the Agg backend and report time, memory and files"""
+    os.environ['MPLBACKEND'] = 'Agg'
+    os.environ[WORKER_BUDGET_ENV] = str(worker_budget)
+    import matplotlib
+    matplotlib.use('Agg')
+    
+    os.chdir(repo_root)
+    if script_dir not in sys.path:
+        sys.path.insert(0, script_dir)
+    
+    # Audit hooks cannot be removed, but every task runs in a fresh process
+    reads, writes = set(), set()
+    _track_file_access(reads, writes)
+    
+    start = time.perf_counter()
+    error = None
+    with open(log_path, 'w') as log, contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+        try:
+            runpy.run_path(path, run_name='__main__')
+        except BaseException:
+            error = traceback.format_exc()
+            log.write(error)
+    
+    return {'name': name, 'ok': error is None, 'wall_time': time.perf_counter() - start,
+            'peak_rss_mb': _peak_rss_mb(), 'log': log_path,
+            'reads': sorted(reads - writes), 'writes': sorted(writes)}
+
+def _load_timings():
+    """Wall times of the previous run, used to start the longest tasks first"""
+    if not os.path.exists(TIMINGS_PATH):
+        return {}
+    with open(TIMINGS_PATH) as f:
+        return json.load(f)
+
+def _load_file_access():
+    """Files each task read and wrote in its last successful run, as {name: {'reads', 'writes'}}"""
+    if not os.path.exists(FILE_ACCESS_PATH):
+        return {}
+    with open(FILE_ACCESS_PATH) as f:
+        return json.load(f)
+
+def derive_dependencies(file_access, declared=TASK_DEPENDENCIES):
+    """Task dependencies: the declared ones plus, for every file a task reads, the tasks writing it"""
+    writers = {}
+    for name, files in file_access.items():
+        for path in files['writes']:
+            writers.setdefault(path, set()).add(name)
+    
+    dependencies = {name: set(deps) for name, deps in declared.items()}
+    for name, files in file_access.items():
+        for path in files['reads']:
+            dependencies.setdefault(name, set()).update(writers.get(path, set()) - {name})
+    return {name: sorted(deps) for name, deps in dependencies.items()}
+
+def _runs_after(dependencies, task, other):
+    """True if ``task`` transitively depends on ``other``"""
+    stack, seen = list(dependencies.get(task, [])), set()
+    while stack:
+        name = stack.pop()
+        if name == other:
+            return True
+        if name not in seen:
+            seen.add(name)
+            stack.extend(dependencies.get(name, []))
+    return False
+
+def check_dependencies(file_access, dependencies, declared=TASK_DEPENDENCIES):
+    """Problems of a dependency graph against the recorded file access, as messages.
+    
+    Reports files written by tasks that are not ordered with respect to
+    each other (the result depends on which finishes last) and declared
+    dependencies between tasks that share no file.
+    """
+    problems = []
+    writers = {}
+    for name, files in sorted(file_access.items()):
+        for path in files['writes']:
+            writers.setdefault(path, []).append(name)
+    
+    for path, names in sorted(writers.items()):
+        for k, first in enumerate(names):
+            for second in names[k + 1:]:
+                if not (_runs_after(dependencies, first, second) or _runs_after(dependencies, second, first)):
+                    problems.append(f"{path} is written by both {first} and {second} in no fixed order")
+    
+    for name, deps in sorted(declared.items()):
+        for dep in deps:
+            if name in file_access and dep in file_access:
+                shared = set(file_access[dep]['writes']) & (set(file_access[name]['writes'])
+                                                            | set(file_access[name]['reads']))
+                if not shared:
+                    problems.append(f"{name} is declared to run after {dep} but uses none of its files")
+    return problems
+
+def run_tasks(tasks, dependencies=None, n_workers=None, log_dir=LOG_DIR):
+    """Run {name: path} tasks in dependency order on a process pool; returns their reports.
+    
+    ``dependencies`` defaults to the graph derived from the file access of
+    the previous run (see derive_dependencies). Dependencies on tasks that
+    are not being run are ignored. A task whose dependency failed is
+    skipped. Every task gets a fresh worker process, so peak memory and
+    file access are measured per task, and a share of the cores
+    (cpu_count / n_workers) for its own process pools.
+    """
+    os.makedirs(log_dir, exist_ok=True)
+    previous_times = _load_timings()
+    file_access = _load_file_access()
+    if dependencies is None:
+        dependencies = derive_dependencies(file_access)
+    n_workers = n_workers or os.cpu_count() or 1
+    worker_budget = max(1, (os.cpu_count() or 1) // n_workers)
+    waiting_on = {name: {dep for dep in dependencies.get(name, []) if dep in tasks} for name in tasks}
+    reports = {}
+    running = {}
+    
+    with ProcessPoolExecutor(max_workers=n_workers, max_tasks_per_child=1) as pool:
+        while waiting_on or running:
+            # Skip everything downstream of a failed task
+            blocked = True
+            while blocked:
+                failed = {name for name, report in reports.items() if not report['ok']}
+                blocked = [name for name, deps in waiting_on.items() if deps & failed]
+                for name in blocked:
+                    reports[name] = {'name': name, 'ok': False, 'skipped': True, 'wall_time': 0.0,
+                                     'peak_rss_mb': None, 'log': None}
+                    del waiting_on[name]
+            
+            ready = [name for name, deps in waiting_on.items() if deps <= set(reports)]
+            for name in sorted(ready, key=lambda n: -previous_times.get(n, float('inf'))):
+                log_path = os.path.join(log_dir, f'{name}.log')
+                running[pool.submit(_run_task, name, tasks[name], log_path, worker_budget)] = name
+                del waiting_on[name]
+                print(f"  started {name}")
+            
+            if not running:
+                if waiting_on:
+                    raise ValueError(f"Circular task dependencies among: {', '.join(sorted(waiting_on))}")
+                break
+            
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    report = future.result()
+                except Exception:
+                    report = {'name': name, 'ok': False, 'wall_time': 0.0, 'peak_rss_mb': None,
+                              'log': os.path.join(log_dir, f'{name}.log'), 'error': traceback.format_exc()}
+                reports[name] = report
+                status = "done" if report['ok'] else "FAILED"
+                print(f"  {status:<7} {name} ({report['wall_time']:.1f} s)")
+    
+    timings = dict(previous_times)
+    timings.update({name: report['wall_time'] for name, report in reports.items() if report['ok']})
+    os.makedirs(os.path.dirname(TIMINGS_PATH), exist_ok=True)
+    with open(TIMINGS_PATH, 'w') as f:
+        json.dump(timings, f, indent=1, sort_keys=True)
+    
+    file_access.update({name: {'reads': report['reads'], 'writes': report['writes']}
+                        for name, report in reports.items() if report['ok']})
+    with open(FILE_ACCESS_PATH, 'w') as f:
+        json.dump(file_access, f, indent=1, sort_keys=True)
+    for problem in check_dependencies(file_access, derive_dependencies(file_access)):
+        print(f"  warning: {problem}")
+    
+    return [reports[name] for name in tasks]
+
+def print_report(reports, total_wall_time):
+    """Per-task wall time and peak RSS, and the speedup over running the tasks one by one"""
+    print(f"\n{'Task':<34}{'Status':<9}{'Wall (s)':>10}{'Peak RSS (MB)':>16}")
+    print("-" * 69)
+    for report in reports:
+        status = 'skipped' if report.get('skipped') else ('ok' if report['ok'] else 'FAILED')
+        rss = f"{report['peak_rss_mb']:.0f}" if report['peak_rss_mb'] is not None else '-'
+        print(f"{report['name']:<34}{status:<9}{report['wall_time']:>10.1f}{rss:>16}")
+    serial_time = sum(report['wall_time'] for report in reports)
+    print("-" * 69)
+    print(f"Total wall time: {total_wall_time:.1f} s  (sum of tasks: {serial_time:.1f} s, "
+          f"speedup {serial_time / max(total_wall_time, 1e-9):.1f}x)")
+    for report in reports:
+        if not report['ok'] and not report.get('skipped'):
+            print(f"  {report['name']} failed, see {report['log']}")
+
+def main(argv=None):
+    """Command line interface: run (or --list) the figure tasks"""
+    parser = argparse.ArgumentParser(description="Regenerate all documentation figures in parallel")
+    parser.add_argument('patterns', nargs='*', help="only tasks whose name contains one of these")
+    parser.add_argument('-j', '--jobs', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--list', action='store_true', help="list the discovered tasks and exit")
+    args = parser.parse_args(argv)
+    
+    tasks = discover_tasks()
+    if args.patterns:
+        tasks = {name: path for name, path in tasks.items() if any(p in name for p in args.patterns)}
+    
+    if args.list:
+        dependencies = derive_dependencies(_load_file_access())
+        for name in tasks:
+            deps = [dep for dep in dependencies.get(name, []) if dep in tasks]
+            print(name + (f"  (after {', '.join(deps)})" if deps else ""))
+        return 0
+    
+    print(f"Running {len(tasks)} figure tasks on {args.jobs or os.cpu_count()} workers")
+    start = time.perf_counter()
+    reports = run_tasks(tasks, n_workers=args.jobs)
+    print_report(reports, time.perf_counter() - start)
+    return 0 if all(report['ok'] for report in reports) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Streaming Animation Frame Sink
+==============================
+
+Writes Matplotlib animation frames straight from the Agg canvas into an
+imageio writer (GIF, or MP4 when imageio-ffmpeg is available; imageio is
+only imported when a writer is opened):
+1. Each frame is the figure's RGBA canvas buffer after ``canvas.draw()``,
+   with no PNG written to a temporary directory and read back
+2. Frames are cropped to the tight bounding box of the first frame (the
+   equivalent of ``savefig(..., bbox_inches='tight')``), so every frame
+   has the same size
+3. The figure is meant to be reused across frames: create the artists
+   once and update them with ``set_data`` / ``set_offsets``
+    
+    with figure_frame_sink(path, fig) as write_frame:
+        for i in range(n_frames):
+            line.set_data(x[:i], y[:i])
+            write_frame()
+
+Author: Physics Class Project
+Date: 2025
+"""
+
+import numpy as np
+import contextlib
+
+def tight_crop(fig, pad_inches=0.1):
+    """Pixel slices (rows, cols) of the figure's tight bounding box, clipped to the canvas"""
+    renderer = fig.canvas.get_renderer()
+    bbox = fig.get_tightbbox(renderer).padded(pad_inches)
+    width, height = fig.canvas.get_width_height()
+    x0, y0, x1, y1 = np.asarray(bbox.extents) * fig.dpi
+    
+    cols = slice(max(0, int(np.floor(x0))), min(width, int(np.ceil(x1))))
+    rows = slice(max(0, height - int(np.ceil(y1))), min(height, height - int(np.floor(y0))))
+    return rows, cols
+
+@contextlib.contextmanager
+def figure_frame_sink(path, fig, dpi=100, tight=True, pad_inches=0.1, duration=0.1, loop=0, fps=None):
+    """Context manager yielding ``write_frame()``, which appends the current figure to ``path``.
+    
+    GIFs use ``duration`` per frame and ``loop``; other formats (e.g. .mp4)
+    are written at ``fps`` frames per second (default 1 / duration).
+    """
+    import imageio
+    fig.set_dpi(dpi)
+    
+    if path.lower().endswith('.gif'):
+        # imageio 2.28+ writes GIFs through Pillow, which takes frame durations in milliseconds
+        version = tuple(int(part) for part in imageio.__version__.split('.')[:2])
+        frame_duration = duration * 1000 if version >= (2, 28) else duration
+        writer = imageio.get_writer(path, mode='I', duration=frame_duration, loop=loop)
+    else:
+        writer = imageio.get_writer(path, fps=fps or 1.0 / duration)
+    
+    crop = []
+    
+    def write_frame():
+        fig.canvas.draw()
+        if not crop:
+            # Fixed on the first frame so every frame has the same size
+            crop.extend(tight_crop(fig, pad_inches) if tight else (slice(None), slice(None)))
+        # Copy: the canvas buffer is overwritten by the next draw
+        frame = np.asarray(fig.canvas.buffer_rgba())[crop[0], crop[1], :3].copy()
+        writer.append_data(frame)
+    
+    try:
+        yield write_frame
+    finally:
+        writer.close()
@@ -3,6 +3,9 @@ import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 from matplotlib.animation import FuncAnimation
 import os
+from parameter_sweep import run_sweep
+from result_cache import cached
+from figure_build import figure_target, build_figures
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
 repo_root = os.path.dirname(script_dir)
@@ -38,6 +41,7 @@ def runge_kutta_step(q, m, E, v, r, B, dt):
     
     return r_new, v_new
 
+@cached
 def simulate_particle_motion(q, m, E, B, v0, r0, dt, steps):
     positions = np.zeros((steps, 3))
     velocities = np.zeros((steps, 3))
@@ -415,8 +419,8 @@ def create_magnetic_bottle_animation():
     print(f"Saved static image to {static_image_path}")
     plt.close(fig)
 
-def run_comprehensive_simulations():
-    """Run all Lorentz force simulations and generate visualizations."""
+def generate_scenario_figures():
+    """Scenarios 1-6 and the combined parameter exploration plot."""
     
     # Physical constants
     q_electron = -1.602e-19  # Electron charge (C)
@@ -424,8 +428,6 @@ def run_comprehensive_simulations():
     q_proton = 1.602e-19     # Proton charge (C)
     m_proton = 1.673e-27     # Proton mass (kg)
     
-    print("Running comprehensive Lorentz force simulations...")
-    
     # Simulation parameters
     dt = 1e-12  # Time step (s)
     steps = 2000  # Number of steps
@@ -495,14 +497,16 @@ def run_comprehensive_simulations():
         np.array([v_select * 1.2, 0.0, 0.0])   # Above selection velocity
     ]
     
+    selector_runs = run_sweep(
+        simulate_particle_motion,
+        [dict(q=q_electron, m=m_electron, E=E_crossed, B=B_crossed, v0=v0_test, r0=r0, dt=dt, steps=steps)
+         for v0_test in velocities_test]
+    )
+    
     fig, axes = plt.subplots(1, 3, figsize=(18, 6))
     labels = ['80% v_select', '100% v_select', '120% v_select']
     
-    for i, v0_test in enumerate(velocities_test):
-        positions_test, _ = simulate_particle_motion(
-            q_electron, m_electron, E_crossed, B_crossed, v0_test, r0, dt, steps
-        )
-        
+    for i, (positions_test, _) in enumerate(selector_runs):
         axes[i].plot(positions_test[:, 0], positions_test[:, 1], 'b-', label='Trajectory')
         axes[i].plot(positions_test[0, 0], positions_test[0, 1], 'go', label='Start')
         axes[i].plot(positions_test[-1, 0], positions_test[-1, 1], 'ro', label='End')
@@ -523,13 +527,15 @@ def run_comprehensive_simulations():
     charges = [q_electron, q_proton]
     particles = ['Electron', 'Proton']
     
+    mass_runs = run_sweep(
+        simulate_particle_motion,
+        [dict(q=charge, m=mass, E=E_zero, B=B_uniform, v0=v0_perp, r0=r0, dt=dt, steps=steps)
+         for mass, charge in zip(masses, charges)]
+    )
+    
     fig, ax = plt.subplots(figsize=(12, 10))
     
-    for i, (mass, charge, particle) in enumerate(zip(masses, charges, particles)):
-        positions_mass, _ = simulate_particle_motion(
-            charge, mass, E_zero, B_uniform, v0_perp, r0, dt, steps
-        )
-        
+    for i, (mass, particle, (positions_mass, _)) in enumerate(zip(masses, particles, mass_runs)):
         ax.plot(positions_mass[:, 0], positions_mass[:, 1], 
                label=f'{particle} (m={mass:.2e} kg)', linewidth=2)
         ax.plot(positions_mass[0, 0], positions_mass[0, 1], 'o', markersize=8)
@@ -547,14 +553,16 @@ def run_comprehensive_simulations():
     print("\n5. Parameter Exploration - Magnetic Field Strength")
     B_strengths = [0.05, 0.1, 0.2]  # Different magnetic field strengths
     
+    field_runs = run_sweep(
+        simulate_particle_motion,
+        [dict(q=q_electron, m=m_electron, E=E_zero, B=np.array([0.0, 0.0, B_strength]),
+              v0=v0_perp, r0=r0, dt=dt, steps=steps)
+         for B_strength in B_strengths]
+    )
+    
     fig, ax = plt.subplots(figsize=(12, 10))
     
-    for B_strength in B_strengths:
-        B_var = np.array([0.0, 0.0, B_strength])
-        positions_B, _ = simulate_particle_motion(
-            q_electron, m_electron, E_zero, B_var, v0_perp, r0, dt, steps
-        )
-        
+    for B_strength, (positions_B, _) in zip(B_strengths, field_runs):
         ax.plot(positions_B[:, 0], positions_B[:, 1], 
                label=f'B = {B_strength} T', linewidth=2)
         ax.plot(positions_B[0, 0], positions_B[0, 1], 'o', markersize=8)
@@ -580,20 +588,12 @@ def run_comprehensive_simulations():
                       save_path=os.path.join(image_dir, 'helical_motion.png'),
                       E=E_zero, B=B_uniform)
     
-    # Scenario 7: Magnetic Bottle
-    print("\n7. Magnetic Bottle Confinement")
-    magnetic_bottle()
-    create_magnetic_bottle_animation()
-    
     # Create combined parameter exploration plot
-    print("\n8. Creating Combined Parameter Exploration Plot")
+    print("\n7. Creating Combined Parameter Exploration Plot")
     fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
     
-    # Mass effect subplot
-    for i, (mass, charge, particle) in enumerate(zip(masses, charges, particles)):
-        positions_mass, _ = simulate_particle_motion(
-            charge, mass, E_zero, B_uniform, v0_perp, r0, dt, steps
-        )
+    # Mass effect subplot (same runs as scenario 4)
+    for particle, (positions_mass, _) in zip(particles, mass_runs):
         ax1.plot(positions_mass[:, 0], positions_mass[:, 1], 
                label=f'{particle}', linewidth=2)
         ax1.plot(positions_mass[0, 0], positions_mass[0, 1], 'o', markersize=6)
@@ -604,12 +604,8 @@ def run_comprehensive_simulations():
     ax1.legend()
     ax1.axis('equal')
     
-    # Field strength effect subplot
-    for B_strength in B_strengths:
-        B_var = np.array([0.0, 0.0, B_strength])
-        positions_B, _ = simulate_particle_motion(
-            q_electron, m_electron, E_zero, B_var, v0_perp, r0, dt, steps
-        )
+    # Field strength effect subplot (same runs as scenario 5)
+    for B_strength, (positions_B, _) in zip(B_strengths, field_runs):
         ax2.plot(positions_B[:, 0], positions_B[:, 1], 
                label=f'B = {B_strength} T', linewidth=2)
         ax2.plot(positions_B[0, 0], positions_B[0, 1], 'o', markersize=6)
@@ -620,11 +616,8 @@ def run_comprehensive_simulations():
     ax2.legend()
     ax2.axis('equal')
     
-    # Velocity selector subplot (middle panel)
-    v0_test = np.array([v_select, 0.0, 0.0])  # At selection velocity
-    positions_test, _ = simulate_particle_motion(
-        q_electron, m_electron, E_crossed, B_crossed, v0_test, r0, dt, steps
-    )
+    # Velocity selector subplot (middle panel, run at the selection velocity)
+    positions_test, _ = selector_runs[1]
     ax3.plot(positions_test[:, 0], positions_test[:, 1], 'b-', label='v = v_select')
     ax3.plot(positions_test[0, 0], positions_test[0, 1], 'go', label='Start')
     ax3.plot(positions_test[-1, 0], positions_test[-1, 1], 'ro', label='End')
@@ -650,6 +643,32 @@ def run_comprehensive_simulations():
     plt.savefig(os.path.join(image_dir, 'parameter_exploration.png'), dpi=300, bbox_inches='tight')
     plt.close()
     print("  Saved parameter exploration plot")
+
+def figure_targets():
+    """Figure build targets of this module (see figure_build.py)."""
+    return [
+        figure_target(generate_scenario_figures, [
+            os.path.join(image_dir, filename) for filename in [
+                'uniform_magnetic_field.png', 'uniform_magnetic_field_3d.png',
+                'combined_fields.png', 'combined_fields_3d.png', 'velocity_selector.png',
+                'mass_effect.png', 'field_strength_effect.png', 'helical_motion.png',
+                'parameter_exploration.png'
+            ]
+        ]),
+        figure_target(magnetic_bottle, [os.path.join(image_dir, 'magnetic_bottle_trajectory.png')]),
+        figure_target(create_magnetic_bottle_animation, [os.path.join(image_dir, 'magnetic_bottle_static.png')]),
+    ]
+
+def run_comprehensive_simulations(force=False, dry_run=False):
+    """Run all Lorentz force simulations and generate visualizations.
+    
+    Figures whose code and parameters are unchanged since the last build are
+    skipped unless ``force`` is set; ``dry_run`` only lists what would run.
+    """
+    print("Running comprehensive Lorentz force simulations...")
+    build_figures(figure_targets(), force=force, dry_run=dry_run)
+    if dry_run:
+        return
     
     print("\nAll simulations completed successfully!")
     print(f"Visualizations saved to: {image_dir}")
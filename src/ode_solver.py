@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+ODE Solver Facade
+=================
+
+Thin wrapper around scipy's solve_ivp shared by the simulation modules.
+Right-hand sides are called as ``fun(t, y, *params)`` with the parameters
+passed through solve_ivp's ``args`` instead of a lambda per call, and are
+declared vectorized (y of shape (d,) or (d, k)) so implicit methods can
+evaluate all finite-difference Jacobian columns in one call.
+
+Author: Physics Class Project
+Date: 2025
+"""
+
+from scipy.integrate import solve_ivp
+
+def solve_system(fun, t_span, y0, params=(), t_eval=None, method=None, stiff=False,
+                 vectorized=True, **options):
+    """Integrate fun(t, y, *params) with solve_ivp.
+
+    If ``method`` is not given it is chosen from ``stiff``: False uses the
+    explicit RK45, True the implicit Radau, and 'auto' LSODA, which switches
+    between the two as the stiffness changes. Extra keyword arguments
+    (rtol, atol, events, ...) are passed on to solve_ivp.
+    """
+    if method is None:
+        if stiff == 'auto':
+            method = 'LSODA'
+        else:
+            method = 'Radau' if stiff else 'RK45'
+    
+    return solve_ivp(fun, t_span, y0, method=method, t_eval=t_eval, args=tuple(params),
+                     vectorized=vectorized, **options)
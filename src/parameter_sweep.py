@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Parameter Sweep Runner
+======================
+
+Runs a simulation function over a list of parameter cases:
+1. Cartesian parameter grids built from named axes
+2. Cases executed in chunks on a process pool (or serially in-process)
+3. Optional on-disk result store with one NPZ file per case, named by a
+   hash of the function and its parameters, so an interrupted sweep
+   resumes by skipping the cases that are already stored
+
+The simulation function is called as ``func(**case)`` and may return a
+NumPy array, a tuple of arrays or a dict of arrays. For process-pool runs
+it must be picklable (a module-level function or a functools.partial of
+one).
+
+Author: Physics Class Project
+Date: 2025
+"""
+
+import numpy as np
+import os
+import json
+import hashlib
+import itertools
+import functools
+import importlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Environment variable with the pool size that n_workers=None stands for.
+# figure_orchestrator.py sets it in each worker so that scripts running side
+# by side share the cores instead of each starting one process per core.
+WORKER_BUDGET_ENV = 'FIGURE_WORKERS'
+
+def default_workers():
+    """Process-pool size for ``n_workers=None``: the FIGURE_WORKERS budget if set, else all cores"""
+    budget = os.environ.get(WORKER_BUDGET_ENV)
+    if budget:
+        return max(1, int(budget))
+    return os.cpu_count() or 1
+
+# Dict subclasses a result may be, as (module, qualified name), most specific
+# first. load_result only rebuilds these classes; it never imports others.
+RESULT_CLASSES = [
+    ('scipy.integrate._ivp.ivp', 'OdeResult'),
+    ('scipy.optimize', 'OptimizeResult'),
+]
+
+def _result_class(module, qualname):
+    """Class of an allowed RESULT_CLASSES entry"""
+    return functools.reduce(getattr, qualname.split('.'), importlib.import_module(module))
+
+def parameter_grid(**axes):
+    """All combinations of the named axes as a list of case dicts (last axis varies fastest)"""
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*axes.values())]
+
+def update_hash(hasher, value):
+    """Feed a parameter value into a hash, arrays by dtype, shape and raw bytes"""
+    if isinstance(value, np.ndarray):
+        hasher.update(f'ndarray{value.dtype.str}{value.shape}'.encode())
+        hasher.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        for key in sorted(value):
+            hasher.update(repr(key).encode())
+            update_hash(hasher, value[key])
+    elif isinstance(value, (list, tuple)):
+        hasher.update(f'{type(value).__name__}{len(value)}'.encode())
+        for item in value:
+            update_hash(hasher, item)
+    elif callable(value) and hasattr(value, '__qualname__'):
+        # Functions by name: their repr contains a per-process address
+        hasher.update(f'callable{value.__module__}.{value.__qualname__}'.encode())
+    else:
+        hasher.update(repr(value).encode())
+
+def parameter_hash(func, case):
+    """Stable hex key of a function (by qualified name) and one parameter case"""
+    hasher = hashlib.sha1()
+    hasher.update(f'{func.__module__}.{getattr(func, "__qualname__", repr(func))}'.encode())
+    update_hash(hasher, case)
+    return hasher.hexdigest()
+
+def _to_json(value):
+    """JSON-friendly copy of a parameter value, for the record stored next to each result"""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, dict):
+        return {str(key): _to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(item) for item in value]
+    return value
+
+def save_result(path, result, case=None):
+    """Write one case result to an NPZ file (atomically, via a temporary file).
+    
+    Dict subclasses keep their class if it is one of RESULT_CLASSES (e.g.
+    solve_ivp's OdeResult); others raise TypeError. None-valued fields and
+    tuple items are recorded by name and come back as None.
+    """
+    if isinstance(result, dict):
+        values = {f'field_{key}': value for key, value in result.items()}
+        kind = 'dict'
+        if type(result) is not dict:
+            allowed = [(module, qualname) for module, qualname in RESULT_CLASSES
+                       if isinstance(result, _result_class(module, qualname))]
+            if not allowed:
+                raise TypeError(f"Cannot store a {type(result).__qualname__} result; "
+                                f"dict subclasses must be one of {RESULT_CLASSES}")
+            kind = 'dict:{}:{}'.format(*allowed[0])
+    elif isinstance(result, tuple):
+        values = {f'item_{k}': value for k, value in enumerate(result)}
+        kind = 'tuple'
+    else:
+        values = {'value': result}
+        kind = 'array'
+    
+    arrays = {name: np.asarray(value) for name, value in values.items() if value is not None}
+    arrays['__none__'] = np.array(sorted(name for name, value in values.items() if value is None), dtype=str)
+    arrays['__kind__'] = np.array(kind)
+    arrays['__params__'] = np.array(json.dumps(_to_json(case), default=repr))
+    
+    tmp_path = path + '.tmp.npz'
+    np.savez(tmp_path, **arrays)
+    os.replace(tmp_path, path)
+
+def load_result(path, with_params=False):
+    """Read a result written by save_result, rebuilding its array / tuple / dict form.
+    
+    A dict class that is not in RESULT_CLASSES raises ValueError.
+    """
+    with np.load(path) as data:
+        kind = str(data['__kind__'])
+        values = {name: data[name] for name in data.files if not name.startswith('__')}
+        if '__none__' in data.files:
+            values.update((str(name), None) for name in data['__none__'])
+        
+        if kind.startswith('dict'):
+            result = {name[len('field_'):]: value for name, value in values.items() if name.startswith('field_')}
+            result = {key: value.item() if value is not None and value.ndim == 0 else value
+                      for key, value in result.items()}
+            if kind != 'dict':
+                _, module, qualname = kind.split(':')
+                if (module, qualname) not in RESULT_CLASSES:
+                    raise ValueError(f"{path} names result class {module}.{qualname}, "
+                                     f"which is not in RESULT_CLASSES")
+                result = _result_class(module, qualname)(result)
+        elif kind == 'tuple':
+            n_items = sum(name.startswith('item_') for name in values)
+            result = tuple(values[f'item_{k}'] for k in range(n_items))
+        else:
+            result = values['value']
+        params = json.loads(str(data['__params__']))
+    
+    return (result, params) if with_params else result
+
+def _run_chunk(func, chunk):
+    """Evaluate one chunk of cases in a worker"""
+    return [func(**case) for case in chunk]
+
+def run_sweep(func, cases, store_dir=None, n_workers=1, chunk_size=None, executor=None,
+              progress=False):
+    """Evaluate ``func(**case)`` for every case and return the results in case order.
+    
+    With ``store_dir`` each result is written to ``<store_dir>/<hash>.npz``
+    as soon as its chunk finishes, and cases whose file already exists are
+    loaded instead of recomputed. With ``n_workers == 1`` (and no
+    ``executor``) the cases run in this process; otherwise they are split
+    into chunks of ``chunk_size`` cases (default: about four chunks per
+    worker) and run on a process pool (``n_workers=None`` uses
+    ``default_workers()`` processes). A caller-supplied ``executor`` is
+    used as is; pass its worker count as ``n_workers`` or set
+    ``chunk_size`` so the chunks match it.
+    """
+    if n_workers is None:
+        n_workers = default_workers()
+    cases = list(cases)
+    results = [None] * len(cases)
+    paths = [None] * len(cases)
+    pending = []
+    
+    if store_dir is not None:
+        os.makedirs(store_dir, exist_ok=True)
+    
+    for k, case in enumerate(cases):
+        if store_dir is not None:
+            paths[k] = os.path.join(store_dir, parameter_hash(func, case) + '.npz')
+            if os.path.exists(paths[k]):
+                results[k] = load_result(paths[k])
+                continue
+        pending.append(k)
+    
+    if progress and store_dir is not None:
+        print(f"  Sweep: {len(cases) - len(pending)} of {len(cases)} cases loaded from {store_dir}")
+    
+    def finish(indices, chunk_results):
+        for k, result in zip(indices, chunk_results):
+            results[k] = result
+            if paths[k] is not None:
+                save_result(paths[k], result, cases[k])
+    
+    if not pending:
+        return results
+    
+    if executor is None and (n_workers == 1 or len(pending) == 1):
+        for k in pending:
+            finish([k], [func(**cases[k])])
+        return results
+    
+    pool = executor if executor is not None else ProcessPoolExecutor(max_workers=n_workers)
+    try:
+        if chunk_size is None:
+            chunk_size = max(1, len(pending) // (4 * n_workers))
+        chunks = [pending[start:start + chunk_size] for start in range(0, len(pending), chunk_size)]
+        
+        futures = {pool.submit(_run_chunk, func, [cases[k] for k in chunk]): chunk for chunk in chunks}
+        for future in as_completed(futures):
+            finish(futures[future], future.result())
+    finally:
+        if executor is None:
+            pool.shutdown()
+    
+    return results
+
+def load_sweep(store_dir):
+    """All stored results of a sweep directory as ``(params, results)`` lists"""
+    params, results = [], []
+    for name in sorted(os.listdir(store_dir)):
+        if name.endswith('.npz') and not name.endswith('.tmp.npz'):
+            result, case = load_result(os.path.join(store_dir, name), with_params=True)
+            params.append(case)
+            results.append(result)
+    
+    return params, results
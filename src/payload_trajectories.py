@@ -2,9 +2,10 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 import os
-import imageio
-import tempfile
-from scipy.integrate import solve_ivp
+from ode_solver import solve_system
+from frame_sink import figure_frame_sink
+from parameter_sweep import run_sweep
+from result_cache import cached
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
 repo_root = os.path.dirname(script_dir)
@@ -19,26 +20,35 @@ def gravitational_acceleration(r, M=M_EARTH):
     return G * M / r**2
 
 def payload_dynamics(t, state, mu=G*M_EARTH):
+    """Two-body equations; state has shape (4,) or (4, k) for solve_ivp(vectorized=True).
+    
+    Columns that are on or below the Earth's surface are frozen (zero derivative).
+    """
+    state = np.asarray(state, dtype=float)
     x, y, vx, vy = state
     
     r = np.sqrt(x**2 + y**2)
+    above_surface = r > R_EARTH
     
-    if r <= R_EARTH:
-        return [0, 0, 0, 0] 
-    
-    a = mu / r**3
+    a = np.where(above_surface, mu / np.maximum(r, R_EARTH)**3, 0.0)
     
-    return [vx, vy, -a * x, -a * y]
+    derivatives = np.empty_like(state)
+    derivatives[0] = np.where(above_surface, vx, 0.0)
+    derivatives[1] = np.where(above_surface, vy, 0.0)
+    derivatives[2] = -a * x
+    derivatives[3] = -a * y
+    return derivatives
 
+@cached
 def simulate_trajectory(initial_position, initial_velocity, t_span, t_eval=None):
     initial_state = [initial_position[0], initial_position[1], 
                     initial_velocity[0], initial_velocity[1]]
     
-    solution = solve_ivp(
+    solution = solve_system(
         payload_dynamics,
         t_span,
         initial_state,
-        method='RK45',
+        params=(G * M_EARTH,),
         t_eval=t_eval,
         rtol=1e-8,
         atol=1e-8
@@ -46,6 +56,10 @@ def simulate_trajectory(initial_position, initial_velocity, t_span, t_eval=None)
     
     return solution
 
+def trajectory_states(position, velocity, t_span):
+    """State history (x, y, vx, vy) of one trajectory, for use with run_sweep"""
+    return simulate_trajectory(position, velocity, t_span).y
+
 def calculate_orbital_parameters(position, velocity, mu=G*M_EARTH):
     r = np.sqrt(position[0]**2 + position[1]**2)
     v = np.sqrt(velocity[0]**2 + velocity[1]**2)
@@ -122,55 +136,52 @@ def plot_trajectory(solution, title="Payload Trajectory", save_path=None):
     return fig, ax
 
 def create_trajectory_animation(solution, title="Payload Trajectory Animation", save_path=None):
-    with tempfile.TemporaryDirectory() as tmpdirname:
-        x = solution.y[0]
-        y = solution.y[1]
-        
-        x_norm = x / R_EARTH
-        y_norm = y / R_EARTH
-        
-        max_dist = max(np.max(np.abs(x_norm)), np.max(np.abs(y_norm)))
-        
-        n_frames = min(100, len(x)) 
-        indices = np.linspace(0, len(x) - 1, n_frames, dtype=int)
-        
-        frames_filenames = []
-        
-        for i, idx in enumerate(indices):
-            fig, ax = plt.subplots(figsize=(10, 10))
-            
-            ax.set_xlim(-max_dist * 1.1, max_dist * 1.1)
-            ax.set_ylim(-max_dist * 1.1, max_dist * 1.1)
-            
-            earth_circle = plt.Circle((0, 0), 1, color='blue', alpha=0.3, label='Earth')
-            ax.add_patch(earth_circle)
-            
-            ax.set_aspect('equal')
-            
-            ax.grid(True, linestyle='--', alpha=0.7)
-            ax.set_xlabel('x (Earth radii)', fontsize=12)
-            ax.set_ylabel('y (Earth radii)', fontsize=12)
-            ax.set_title(title, fontsize=14)
-            
-            ax.plot(x_norm[:idx+1], y_norm[:idx+1], 'b-', label='Trajectory')
-            
-            ax.scatter(x_norm[idx], y_norm[idx], color='red', s=50, label='Payload')
-            
-            ax.legend(loc='upper right')
-            
-            frame_filename = os.path.join(tmpdirname, f'frame_{i:03d}.png')
-            plt.savefig(frame_filename, dpi=100, bbox_inches='tight')
-            frames_filenames.append(frame_filename)
-            
-            plt.close(fig)
-        
-        if save_path:
-            with imageio.get_writer(save_path, mode='I', duration=0.1, loop=0) as writer:
-                for frame_filename in frames_filenames:
-                    image = imageio.imread(frame_filename)
-                    writer.append_data(image)
+    x = solution.y[0]
+    y = solution.y[1]
+    
+    x_norm = x / R_EARTH
+    y_norm = y / R_EARTH
+    
+    max_dist = max(np.max(np.abs(x_norm)), np.max(np.abs(y_norm)))
+    
+    n_frames = min(100, len(x)) 
+    indices = np.linspace(0, len(x) - 1, n_frames, dtype=int)
+    
+    if not save_path:
+        return
+    
+    # One figure for all frames: the trajectory line and payload marker are updated in place
+    fig, ax = plt.subplots(figsize=(10, 10))
+    
+    ax.set_xlim(-max_dist * 1.1, max_dist * 1.1)
+    ax.set_ylim(-max_dist * 1.1, max_dist * 1.1)
+    
+    earth_circle = plt.Circle((0, 0), 1, color='blue', alpha=0.3, label='Earth')
+    ax.add_patch(earth_circle)
+    
+    ax.set_aspect('equal')
+    
+    ax.grid(True, linestyle='--', alpha=0.7)
+    ax.set_xlabel('x (Earth radii)', fontsize=12)
+    ax.set_ylabel('y (Earth radii)', fontsize=12)
+    ax.set_title(title, fontsize=14)
+    
+    trajectory_line, = ax.plot(x_norm[:1], y_norm[:1], 'b-', label='Trajectory')
+    
+    payload_marker = ax.scatter(x_norm[0], y_norm[0], color='red', s=50, label='Payload')
+    
+    ax.legend(loc='upper right')
+    
+    with figure_frame_sink(save_path, fig, dpi=100) as write_frame:
+        for idx in indices:
+            trajectory_line.set_data(x_norm[:idx+1], y_norm[:idx+1])
+            payload_marker.set_offsets([[x_norm[idx], y_norm[idx]]])
+            write_frame()
+    
+    plt.close(fig)
 
-def plot_multiple_trajectories(initial_conditions, t_span, title="Multiple Payload Trajectories", save_path=None):
+def plot_multiple_trajectories(initial_conditions, t_span, title="Multiple Payload Trajectories", save_path=None,
+                               n_workers=1):
     fig, ax = plt.subplots(figsize=(12, 12))
     
     earth_circle = plt.Circle((0, 0), 1, color='blue', alpha=0.3, label='Earth')
@@ -185,22 +196,22 @@ def plot_multiple_trajectories(initial_conditions, t_span, title="Multiple Paylo
     
     max_dist = 1.0  
     
-    for i, condition in enumerate(initial_conditions):
-        initial_position = condition['position']
-        initial_velocity = condition['velocity']
+    cases = [dict(position=condition['position'], velocity=condition['velocity'], t_span=t_span)
+             for condition in initial_conditions]
+    all_states = run_sweep(trajectory_states, cases, n_workers=n_workers)
+    
+    for i, (condition, states) in enumerate(zip(initial_conditions, all_states)):
         label = condition.get('label', f'Trajectory {i+1}')
         color = condition.get('color', None)
         
-        solution = simulate_trajectory(initial_position, initial_velocity, t_span)
-        
-        x = solution.y[0] / R_EARTH
-        y = solution.y[1] / R_EARTH
+        x = states[0] / R_EARTH
+        y = states[1] / R_EARTH
         
         max_dist = max(max_dist, np.max(np.abs(x)), np.max(np.abs(y)))
         
         params = calculate_orbital_parameters(
-            [solution.y[0][0], solution.y[1][0]],
-            [solution.y[2][0], solution.y[3][0]]
+            [states[0][0], states[1][0]],
+            [states[2][0], states[3][0]]
         )
         
         ax.plot(x, y, label=f"{label} ({params['orbit_type']})", color=color)
@@ -1,9 +1,15 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.integrate import solve_ivp
 from matplotlib.animation import FuncAnimation
 import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from scipy.stats import sem, t
+from scipy.special import j0, j1
+
+from ode_solver import solve_system
+from poincare_maps import stroboscopic_section
+from parameter_sweep import run_sweep, default_workers
 
 # Get the correct path to the images directories
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -13,17 +19,136 @@ measurements_image_dir = os.path.join(repo_root, 'docs', '1 Physics', '7 Measure
 os.makedirs(mechanics_image_dir, exist_ok=True)
 os.makedirs(measurements_image_dir, exist_ok=True)
 
+# Parameters of the driven damped pendulum, passed to the RHS as solve_ivp args
+PendulumParams = namedtuple('PendulumParams', ['b', 'A', 'omega_d', 'omega_0_sq'])
+
 def pendulum_system(t, y, b, A, omega_d, omega_0_sq):
+    """Pendulum equations; y has shape (2,) or (2, k) for solve_ivp(vectorized=True)"""
+    y = np.asarray(y, dtype=float)
     theta, omega = y
-    dtheta_dt = omega
-    domega_dt = -omega_0_sq * np.sin(theta) - b * omega + A * np.cos(omega_d * t)
-    return [dtheta_dt, domega_dt]
+    dydt = np.empty_like(y)
+    dydt[0] = omega
+    dydt[1] = -omega_0_sq * np.sin(theta) - b * omega + A * np.cos(omega_d * t)
+    return dydt
 
 def linear_pendulum_system(t, y, b, A, omega_d, omega_0_sq):
+    """Small-angle pendulum equations; y has shape (2,) or (2, k)"""
+    y = np.asarray(y, dtype=float)
     theta, omega = y
-    dtheta_dt = omega
-    domega_dt = -omega_0_sq * theta - b * omega + A * np.cos(omega_d * t)
-    return [dtheta_dt, domega_dt]
+    dydt = np.empty_like(y)
+    dydt[0] = omega
+    dydt[1] = -omega_0_sq * theta - b * omega + A * np.cos(omega_d * t)
+    return dydt
+
+def pendulum_trajectory(b, A, omega_d, omega_0_sq, y0, t_span, t_eval):
+    """State history y of shape (2, len(t_eval)) for one parameter set, for use with run_sweep"""
+    sol = solve_system(
+        pendulum_system, t_span, y0, t_eval=t_eval,
+        params=PendulumParams(b, A, omega_d, omega_0_sq)
+    )
+    return sol.y
+
+def pendulum_ensemble_rhs(states, t, params):
+    """Pendulum equations for an (N, 2) ensemble; params columns are (b, A, omega_d, omega_0_sq)"""
+    return pendulum_system(t, states.T, *params.T).T
+
+def pendulum_bifurcation_sweep(A_values, b, omega_d, omega_0_sq, y0=(0.2, 0), n_transient=100,
+                               n_periods=100, steps_per_period=200, n_workers=1):
+    """Stroboscopic samples of theta for many driving amplitudes at once.
+
+    All amplitudes are integrated as one (n_A, 2) ensemble and sampled
+    exactly once per driving period after ``n_transient`` periods. The
+    defaults discard 100 periods, long enough for the damped transient
+    (decay time 2/b) to die out for b >= 0.1 at drive periods of a few
+    seconds, and keep 100 samples per amplitude, enough to resolve the
+    period-doubling branches and fill the chaotic bands. With
+    ``n_workers`` other than 1 the amplitudes are split into chunks that
+    run in a process pool (``None``: ``default_workers()`` processes).
+    Returns an (n_periods, n_A) array.
+    """
+    A_values = np.asarray(A_values, dtype=float)
+    driving_period = 2 * np.pi / omega_d
+    
+    def chunk_args(A_chunk):
+        params = np.column_stack([np.full(A_chunk.size, b), A_chunk,
+                                  np.full(A_chunk.size, omega_d), np.full(A_chunk.size, omega_0_sq)])
+        initial_states = np.tile(np.asarray(y0, dtype=float), (A_chunk.size, 1))
+        return (pendulum_ensemble_rhs, initial_states, params, driving_period,
+                n_periods, n_transient, steps_per_period)
+    
+    if n_workers is None:
+        n_workers = default_workers()
+    
+    if n_workers == 1:
+        section = stroboscopic_section(*chunk_args(A_values))
+    else:
+        chunks = [c for c in np.array_split(A_values, 4 * n_workers) if c.size]
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            futures = [pool.submit(stroboscopic_section, *chunk_args(c)) for c in chunks]
+            section = np.concatenate([f.result() for f in futures], axis=1)
+    
+    return section[:, :, 0]
+
+def _steady_state_by_integration(omega_d, b, A, omega_0_sq, y0, t_transient, t_end):
+    """Amplitude and phase of theta(t) over [t_transient, t_end] from a direct solve_ivp run"""
+    t_eval = np.linspace(t_transient, t_end, 1000)
+    sol = solve_system(
+        pendulum_system, (0, t_end), y0, t_eval=t_eval,
+        params=PendulumParams(b, A, omega_d, omega_0_sq)
+    )
+    theta = sol.y[0]
+    amplitude = (np.max(theta) - np.min(theta)) / 2
+    # Phase lag from the projection of theta onto the drive
+    phase = np.arctan2(np.mean(theta * np.sin(omega_d * sol.t)), np.mean(theta * np.cos(omega_d * sol.t)))
+    return amplitude, phase
+
+def pendulum_resonance_curve(driving_frequencies, b, A, omega_0_sq, method='harmonic_balance',
+                             y0=(0.2, 0), t_transient=80, t_end=100, tol=1e-12, max_newton=50):
+    """Steady-state amplitude and phase of the driven pendulum for a sweep of frequencies.
+
+    With ``method='harmonic_balance'`` theta = X cos(omega t - phi) is
+    substituted with sin(X cos u) ~ 2 J1(X) cos u, giving
+    (2 omega_0^2 J1(X) - omega^2 X)^2 + (b omega X)^2 = A^2, which is solved
+    by Newton's method warm-started from the previous frequency's solution
+    (so the sweep follows one response branch). Frequencies where Newton
+    does not converge, or all of them with ``method='integrate'``, are
+    computed by direct integration over [t_transient, t_end] instead.
+    Returns ``(amplitudes, phases)``.
+    """
+    driving_frequencies = np.asarray(driving_frequencies, dtype=float)
+    amplitudes = np.empty(driving_frequencies.size)
+    phases = np.empty(driving_frequencies.size)
+    X = None
+    
+    for i, omega_d in enumerate(driving_frequencies):
+        converged = False
+        if method == 'harmonic_balance':
+            if X is None:
+                # Linear response as the first guess
+                X = A / np.hypot(omega_0_sq - omega_d**2, b * omega_d)
+            for _ in range(max_newton):
+                K = 2 * omega_0_sq * j1(X) - omega_d**2 * X
+                F = K**2 + (b * omega_d * X)**2 - A**2
+                dK = 2 * omega_0_sq * (j0(X) - j1(X) / X) - omega_d**2
+                step = F / (2 * K * dK + 2 * (b * omega_d)**2 * X)
+                X -= step
+                if abs(step) < tol * max(abs(X), 1.0):
+                    # The balance equation is even in X: a negative root is the same response
+                    X = abs(X)
+                    converged = True
+                    break
+        elif method != 'integrate':
+            raise ValueError(f"Unknown method: {method}")
+        
+        if converged:
+            amplitudes[i] = X
+            phases[i] = np.arctan2(b * omega_d * X, 2 * omega_0_sq * j1(X) - omega_d**2 * X)
+        else:
+            amplitudes[i], phases[i] = _steady_state_by_integration(
+                omega_d, b, A, omega_0_sq, y0, t_transient, t_end)
+            X = amplitudes[i] if amplitudes[i] > 0 else None
+    
+    return amplitudes, phases
 
 def generate_main_plot():
     """Generate the main plot referenced in the markdown as problem2.png"""
@@ -42,9 +167,9 @@ def generate_main_plot():
     t_eval = np.linspace(0, 50, 1000)  # time steps
     
     # Solve the ODE
-    sol = solve_ivp(
-        lambda t, y: pendulum_system(t, y, b, A, omega_d, omega_0_sq),
-        t_span, y0, t_eval=t_eval, method='RK45'
+    sol = solve_system(
+        pendulum_system, t_span, y0, t_eval=t_eval,
+        params=PendulumParams(b, A, omega_d, omega_0_sq)
     )
     
     # Create the plot
@@ -82,16 +207,14 @@ def run_comprehensive_analysis():
     A = 0.5  
     omega_d = omega_0  
 
+    common = dict(omega_d=omega_d, omega_0_sq=omega_0_sq, y0=y0, t_span=t_span, t_eval=t_eval)
+    trajectories = run_sweep(pendulum_trajectory, [dict(common, b=b, A=A) for b in damping_coefficients])
+
     plt.figure(figsize=(12, 8))
 
-    for i, b in enumerate(damping_coefficients):
-        sol = solve_ivp(
-            lambda t, y: pendulum_system(t, y, b, A, omega_d, omega_0_sq),
-            t_span, y0, t_eval=t_eval, method='RK45'
-        )
-        
+    for i, (b, y) in enumerate(zip(damping_coefficients, trajectories)):
         plt.subplot(2, 2, i+1)
-        plt.plot(sol.t, sol.y[0], 'b-')
+        plt.plot(t_eval, y[0], 'b-')
         plt.grid(True)
         plt.title(f'Damping Coefficient b = {b}')
         plt.xlabel('Time (s)')
@@ -105,16 +228,13 @@ def run_comprehensive_analysis():
     driving_amplitudes = [0.1, 0.5, 1.0, 2.0]
     b = 0.5 
 
+    trajectories = run_sweep(pendulum_trajectory, [dict(common, b=b, A=A) for A in driving_amplitudes])
+
     plt.figure(figsize=(12, 8))
 
-    for i, A in enumerate(driving_amplitudes):
-        sol = solve_ivp(
-            lambda t, y: pendulum_system(t, y, b, A, omega_d, omega_0_sq),
-            t_span, y0, t_eval=t_eval, method='RK45'
-        )
-        
+    for i, (A, y) in enumerate(zip(driving_amplitudes, trajectories)):
         plt.subplot(2, 2, i+1)
-        plt.plot(sol.t, sol.y[0], 'r-')
+        plt.plot(t_eval, y[0], 'r-')
         plt.grid(True)
         plt.title(f'Driving Amplitude A = {A}')
         plt.xlabel('Time (s)')
@@ -129,19 +249,7 @@ def run_comprehensive_analysis():
     b = 0.2  
     A = 0.5  
 
-    t_span_steady = (0, 100) 
-    t_eval_steady = np.linspace(80, 100, 1000)  
-
-    amplitudes = []
-
-    for omega_d in driving_frequencies:
-        sol = solve_ivp(
-            lambda t, y: pendulum_system(t, y, b, A, omega_d, omega_0_sq),
-            t_span_steady, y0, t_eval=t_eval_steady, method='RK45'
-        )
-        
-        amplitude = (np.max(sol.y[0]) - np.min(sol.y[0])) / 2
-        amplitudes.append(amplitude)
+    amplitudes, phases = pendulum_resonance_curve(driving_frequencies, b, A, omega_0_sq)
 
     plt.figure(figsize=(10, 6))
     plt.plot(driving_frequencies / omega_0, amplitudes, 'g-', linewidth=2)
@@ -162,9 +270,9 @@ def run_comprehensive_analysis():
     t_span_long = (0, 200)
     t_eval_long = np.linspace(*t_span_long, 10000)
 
-    sol_chaotic = solve_ivp(
-        lambda t, y: pendulum_system(t, y, b, A, omega_d, omega_0_sq),
-        t_span_long, y0, t_eval=t_eval_long, method='RK45'
+    sol_chaotic = solve_system(
+        pendulum_system, t_span_long, y0, t_eval=t_eval_long,
+        params=PendulumParams(b, A, omega_d, omega_0_sq)
     )
 
     plt.figure(figsize=(10, 8))
@@ -185,18 +293,14 @@ def run_comprehensive_analysis():
     plt.savefig(os.path.join(mechanics_image_dir, 'phase_space.png'), dpi=300, bbox_inches='tight')
     plt.close()
 
-    # 5. Poincaré section
+    # 5. Poincaré section, sampled exactly at multiples of the driving period
     driving_period = 2 * np.pi / omega_d
     n_periods = int(t_span_long[1] / driving_period)
-    poincare_points = []
-
-    for i in range(n_periods):
-        t_target = i * driving_period
-        idx = np.argmin(np.abs(sol_chaotic.t - t_target))
-        if idx < len(sol_chaotic.t):
-            poincare_points.append([sol_chaotic.y[0][idx], sol_chaotic.y[1][idx]])
-
-    poincare_points = np.array(poincare_points)
+    # Keep the step at or below the 0.01 s resolution of a dense trajectory
+    steps_per_period = int(np.ceil(driving_period / 0.01))
+    section = stroboscopic_section(pendulum_ensemble_rhs, [y0], (b, A, omega_d, omega_0_sq),
+                                   driving_period, n_periods, steps_per_period=steps_per_period)
+    poincare_points = section[:, 0, :]
 
     plt.figure(figsize=(8, 8))
     plt.scatter(poincare_points[:, 0], poincare_points[:, 1], s=5, c='blue')
@@ -213,25 +317,14 @@ def run_comprehensive_analysis():
     b = 0.1  
     omega_d = 2/3 * omega_0  
 
-    t_span_bif = (0, 200)
-    t_eval_bif = np.linspace(100, 200, 5000)  
-
-    bifurcation_data = []
-
-    for A_val in A_values:
-        sol = solve_ivp(
-            lambda t, y: pendulum_system(t, y, b, A_val, omega_d, omega_0_sq),
-            t_span_bif, y0, t_eval=t_eval_bif, method='RK45'
-        )
-        
-        driving_period = 2 * np.pi / omega_d
-        t_mod = sol.t % driving_period
-        indices = np.where(t_mod < driving_period/50)[0]  
-        
-        for idx in indices:
-            bifurcation_data.append([A_val, sol.y[0][idx]])
+    # Skip the first 100 s, then take 100 samples per amplitude (one per driving period)
+    driving_period = 2 * np.pi / omega_d
+    n_transient = int(np.ceil(100 / driving_period))
+    n_samples = 100
 
-    bifurcation_data = np.array(bifurcation_data)
+    theta_samples = pendulum_bifurcation_sweep(A_values, b, omega_d, omega_0_sq, y0,
+                                               n_transient=n_transient, n_periods=n_samples)
+    bifurcation_data = np.column_stack([np.tile(A_values, n_samples), theta_samples.ravel()])
 
     plt.figure(figsize=(10, 6))
     plt.scatter(bifurcation_data[:, 0], bifurcation_data[:, 1], s=0.5, c='black')
@@ -247,14 +340,14 @@ def run_comprehensive_analysis():
     A = 0.5 
     omega_d = omega_0  
 
-    sol_linear = solve_ivp(
-        lambda t, y: linear_pendulum_system(t, y, b, A, omega_d, omega_0_sq),
-        t_span, y0, t_eval=t_eval, method='RK45'
+    sol_linear = solve_system(
+        linear_pendulum_system, t_span, y0, t_eval=t_eval,
+        params=PendulumParams(b, A, omega_d, omega_0_sq)
     )
 
-    sol_nonlinear = solve_ivp(
-        lambda t, y: pendulum_system(t, y, b, A, omega_d, omega_0_sq),
-        t_span, y0, t_eval=t_eval, method='RK45'
+    sol_nonlinear = solve_system(
+        pendulum_system, t_span, y0, t_eval=t_eval,
+        params=PendulumParams(b, A, omega_d, omega_0_sq)
     )
 
     plt.figure(figsize=(12, 6))
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Poincaré Section Engine
+=======================
+
+Shared tools for computing Poincaré sections of ensembles of trajectories:
+1. Stroboscopic sections of periodically driven systems, sampled with an
+   exact whole number of RK4 steps per drive period (no drift off the section)
+2. General surfaces of section g(state, t) = 0, located by event detection
+   and root-finding on the cubic Hermite interpolant of each RK4 step
+
+All initial conditions and parameter sets are advanced together as one
+(N, d) array. Only the section hits are returned, so memory grows with the
+number of crossings rather than with the number of integration steps.
+
+Right-hand sides use the ensemble convention ``rhs(states, t, params)`` with
+states of shape (N, d) and params of shape (N, p) or (1, p).
+
+Author: Physics Class Project
+Date: 2025
+"""
+
+import numpy as np
+
+def runge_kutta_4th(func, state, t, dt, *args):
+    """4th order Runge-Kutta integration"""
+    k1 = func(state, t, *args)
+    k2 = func(state + 0.5*dt*k1, t + 0.5*dt, *args)
+    k3 = func(state + 0.5*dt*k2, t + 0.5*dt, *args)
+    k4 = func(state + dt*k3, t + dt, *args)
+    return state + (dt/6.0) * (k1 + 2*k2 + 2*k3 + k4)
+
+def _ensemble_params(params, n_members):
+    """Parameter table of shape (n_members, p) from a shared tuple or a per-member table"""
+    params = np.asarray(params, dtype=float)
+    if params.ndim == 1:
+        params = params[np.newaxis, :]
+    return np.broadcast_to(params, (n_members, params.shape[1]))
+
+def stroboscopic_section(rhs, initial_states, params, period, n_periods, n_transient=0,
+                         steps_per_period=100, t0=0.0):
+    """Sample an ensemble once per drive period.
+    
+    The step is ``dt = period / steps_per_period`` so every sample lands
+    exactly on ``t0 + k*period``. Returns an (n_periods, N, d) array with
+    the states at periods ``n_transient, ..., n_transient + n_periods - 1``.
+    """
+    states = np.array(initial_states, dtype=float)
+    params = _ensemble_params(params, len(states))
+    dt = period / steps_per_period
+    section = np.empty((n_periods,) + states.shape)
+    
+    for k in range(n_transient + n_periods):
+        if k >= n_transient:
+            section[k - n_transient] = states
+        t_start = t0 + k * period
+        for step in range(steps_per_period):
+            states = runge_kutta_4th(rhs, states, t_start + step * dt, dt, params)
+    
+    return section
+
+def _hermite(y0, f0, y1, f1, dt, s):
+    """Cubic Hermite interpolant of one step, evaluated at fractions s in [0, 1]"""
+    s = s[:, np.newaxis]
+    s2, s3 = s * s, s * s * s
+    return ((2*s3 - 3*s2 + 1) * y0 + (s3 - 2*s2 + s) * dt * f0
+            + (-2*s3 + 3*s2) * y1 + (s3 - s2) * dt * f1)
+
+def surface_section(rhs, initial_states, params, surface, dt, num_steps, direction=1, t0=0.0,
+                    refine_iterations=8):
+    """Crossings of an ensemble with the surface ``surface(states, t) == 0``.
+    
+    ``surface`` must be vectorized: states of shape (M, d) and t a scalar
+    or an (M,) array. ``direction`` = 1 keeps crossings where g goes from
+    negative to non-negative, -1 the opposite, 0 both. Each crossing is
+    located inside its step by regula falsi on the Hermite interpolant.
+    Returns ``(times, members, states)`` arrays with one row per hit.
+    """
+    states = np.array(initial_states, dtype=float)
+    params = _ensemble_params(params, len(states))
+    
+    hit_times, hit_members, hit_states = [], [], []
+    g_old = surface(states, t0)
+    
+    for i in range(num_steps):
+        t = t0 + i * dt
+        new_states = runge_kutta_4th(rhs, states, t, dt, params)
+        g_new = surface(new_states, t + dt)
+        
+        upward = (g_old < 0) & (g_new >= 0)
+        downward = (g_old > 0) & (g_new <= 0)
+        crossed = upward if direction > 0 else downward if direction < 0 else upward | downward
+        
+        if np.any(crossed):
+            members = np.nonzero(crossed)[0]
+            y0, y1 = states[members], new_states[members]
+            f0 = rhs(y0, t, params[members])
+            f1 = rhs(y1, t + dt, params[members])
+            
+            # Regula falsi on s in [0, 1], all hits of this step at once
+            lo, hi = np.zeros(members.size), np.ones(members.size)
+            g_lo, g_hi = g_old[members], g_new[members]
+            s = lo
+            for _ in range(refine_iterations):
+                s = lo - g_lo * (hi - lo) / np.where(g_hi != g_lo, g_hi - g_lo, 1.0)
+                g_s = surface(_hermite(y0, f0, y1, f1, dt, s), t + s * dt)
+                same_side = np.sign(g_s) == np.sign(g_lo)
+                lo, g_lo = np.where(same_side, s, lo), np.where(same_side, g_s, g_lo)
+                hi, g_hi = np.where(same_side, hi, s), np.where(same_side, g_hi, g_s)
+            
+            hit_times.append(t + s * dt)
+            hit_members.append(members)
+            hit_states.append(_hermite(y0, f0, y1, f1, dt, s))
+        
+        states, g_old = new_states, g_new
+    
+    if not hit_times:
+        return np.empty(0), np.empty(0, dtype=int), np.empty((0, states.shape[1]))
+    
+    return np.concatenate(hit_times), np.concatenate(hit_members), np.concatenate(hit_states)
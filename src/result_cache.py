@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Simulation Result Cache
+=======================
+
+Content-addressed on-disk memoization for expensive simulations:
+1. ``@cached`` functions are keyed on their qualified name, the hashes of
+   the code they depend on (see figure_build.source_dependencies: their own
+   source, the functions and constants of their module they use and the
+   other src/ modules they call into) and their bound arguments
+2. Results (arrays, tuples or dicts of arrays, OdeResult objects) are stored
+   as NPZ files through the parameter_sweep result format
+3. The cache is bounded in size; the least recently used entries (by file
+   modification time, refreshed on every hit) are evicted first
+4. A small command line interface lists, prunes and clears the cache:
+
+       python result_cache.py stats
+       python result_cache.py list
+       python result_cache.py prune --max-size 200M
+       python result_cache.py clear
+
+Environment variables: SIMULATION_CACHE_DIR (default ``<repo>/.cache/simulations``),
+SIMULATION_CACHE_MAX_SIZE (default 1G) and SIMULATION_CACHE=0 to disable.
+
+Author: Physics Class Project
+Date: 2025
+"""
+
+import os
+import sys
+import time
+import inspect
+import hashlib
+import argparse
+import functools
+
+from parameter_sweep import update_hash, save_result, load_result
+from figure_build import source_dependencies
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+repo_root = os.path.dirname(script_dir)
+DEFAULT_CACHE_DIR = os.path.join(repo_root, '.cache', 'simulations')
+
+def parse_size(text):
+    """Byte count from a size such as '500M', '2G' or '1048576'"""
+    text = str(text).strip().upper().rstrip('B')
+    units = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+def cache_dir():
+    """Cache directory from SIMULATION_CACHE_DIR, else <repo>/.cache/simulations"""
+    return os.environ.get('SIMULATION_CACHE_DIR', DEFAULT_CACHE_DIR)
+
+def cache_enabled():
+    """False when SIMULATION_CACHE is set to 0 / off"""
+    return os.environ.get('SIMULATION_CACHE', '1').lower() not in ('0', 'off', 'false', 'no')
+
+def max_cache_size():
+    """Size limit in bytes from SIMULATION_CACHE_MAX_SIZE (default 1G)"""
+    return parse_size(os.environ.get('SIMULATION_CACHE_MAX_SIZE', '1G'))
+
+@functools.lru_cache(maxsize=None)
+def code_hash(func):
+    """Hash of the code ``func`` depends on, so editing it or a module it uses invalidates its results"""
+    hasher = hashlib.sha1()
+    update_hash(hasher, source_dependencies(func))
+    return hasher.hexdigest()
+
+def cache_key(func, args, kwargs):
+    """Key of one call: function name, hash of the code it depends on and its bound arguments"""
+    bound = inspect.signature(func).bind(*args, **kwargs)
+    bound.apply_defaults()
+    
+    hasher = hashlib.sha1()
+    hasher.update(f'{func.__module__}.{func.__qualname__}'.encode())
+    hasher.update(code_hash(func).encode())
+    update_hash(hasher, dict(bound.arguments))
+    return hasher.hexdigest()
+
+def cache_entries(directory=None):
+    """(path, size, last_used) of every entry, least recently used first"""
+    directory = directory or cache_dir()
+    if not os.path.isdir(directory):
+        return []
+    
+    entries = []
+    for name in os.listdir(directory):
+        if name.endswith('.npz') and not name.endswith('.tmp.npz'):
+            path = os.path.join(directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+    
+    return sorted(entries, key=lambda entry: entry[2])
+
+def prune_cache(max_size=None, directory=None):
+    """Delete least recently used entries until the cache fits in max_size bytes; returns bytes freed"""
+    max_size = max_cache_size() if max_size is None else max_size
+    entries = cache_entries(directory)
+    total = sum(size for _, size, _ in entries)
+    freed = 0
+    
+    for path, size, _ in entries:
+        if total - freed <= max_size:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        freed += size
+    
+    return freed
+
+def cached(func):
+    """Memoize a simulation function on disk (see module docstring)"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not cache_enabled():
+            return func(*args, **kwargs)
+        
+        directory = cache_dir()
+        key = cache_key(func, args, kwargs)
+        path = os.path.join(directory, f'{func.__name__}-{key}.npz')
+        
+        if os.path.exists(path):
+            try:
+                result = load_result(path)
+                os.utime(path)
+                return result
+            except (OSError, ValueError, KeyError):
+                pass
+        
+        result = func(*args, **kwargs)
+        os.makedirs(directory, exist_ok=True)
+        save_result(path, result)
+        prune_cache(directory=directory)
+        return result
+    
+    wrapper.uncached = func
+    return wrapper
+
+def format_size(n_bytes):
+    """Human-readable byte count"""
+    for unit in ['B', 'K', 'M']:
+        if n_bytes < 1024:
+            return f"{n_bytes:.0f}{unit}" if unit == 'B' else f"{n_bytes:.1f}{unit}"
+        n_bytes /= 1024
+    return f"{n_bytes:.1f}G"
+
+def main(argv=None):
+    """Command line interface: stats, list, prune and clear"""
+    parser = argparse.ArgumentParser(description="Inspect and prune the simulation result cache")
+    parser.add_argument('--dir', default=None, help="cache directory (default: SIMULATION_CACHE_DIR or <repo>/.cache/simulations)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('stats', help="number of entries and total size")
+    commands.add_parser('list', help="entries, least recently used first")
+    prune = commands.add_parser('prune', help="evict least recently used entries")
+    prune.add_argument('--max-size', default=None, help="size to shrink to, e.g. 200M (default: the cache limit)")
+    commands.add_parser('clear', help="delete every entry")
+    args = parser.parse_args(argv)
+    
+    directory = args.dir or cache_dir()
+    entries = cache_entries(directory)
+    total = sum(size for _, size, _ in entries)
+    
+    if args.command == 'stats':
+        print(f"Cache directory: {directory}")
+        print(f"Entries: {len(entries)}  Size: {format_size(total)}  Limit: {format_size(max_cache_size())}")
+    elif args.command == 'list':
+        for path, size, last_used in entries:
+            stamp = time.strftime('%Y-%m-%d %H:%M', time.localtime(last_used))
+            print(f"{stamp}  {format_size(size):>8}  {os.path.basename(path)}")
+    elif args.command == 'prune':
+        max_size = max_cache_size() if args.max_size is None else parse_size(args.max_size)
+        freed = prune_cache(max_size, directory)
+        print(f"Freed {format_size(freed)}")
+    elif args.command == 'clear':
+        freed = prune_cache(0, directory)
+        print(f"Removed {len(entries)} entries ({format_size(freed)})")
+    
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,7 @@ from matplotlib.animation import FuncAnimation
 import os
 from mpl_toolkits.mplot3d import Axes3D
 from matplotlib import cm
+from figure_build import figure_target, build_figures
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
 repo_root = os.path.dirname(script_dir)
@@ -30,6 +31,62 @@ def calculate_total_displacement(x, y, t, sources):
         total += calculate_displacement(x, y, t, source_pos)
     return total
 
+def _source_distance_tiles(x, y, sources, max_tile_elements):
+    """Yield (rows, r, singular) per row tile: distances r of shape (n_sources, tile_rows, len(x))
+    and the mask of pixels closer than 1e-10 to a source (where r is set to 1)"""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    sources = np.asarray(sources, dtype=float).reshape(-1, 2)
+    
+    dx2 = (x[np.newaxis, np.newaxis, :] - sources[:, 0, np.newaxis, np.newaxis])**2
+    rows_per_tile = max(1, max_tile_elements // max(1, len(sources) * x.size))
+    
+    for start in range(0, y.size, rows_per_tile):
+        rows = slice(start, start + rows_per_tile)
+        dy = y[np.newaxis, rows, np.newaxis] - sources[:, 1, np.newaxis, np.newaxis]
+        r = np.sqrt(dx2 + dy**2)
+        singular = r < 1e-10
+        r[singular] = 1.0
+        yield rows, r, singular
+
+def displacement_field(x, y, t, sources, max_tile_elements=1 << 22):
+    """Total displacement on the grid meshgrid(x, y) at time t, shape (len(y), len(x)).
+    
+    All sources are summed at once by broadcasting; rows are processed in
+    tiles of at most max_tile_elements (source, pixel) pairs to bound memory.
+    As in calculate_displacement, a source contributes nothing at pixels
+    closer than 1e-10 to it.
+    """
+    Z = np.zeros((np.size(y), np.size(x)))
+    for rows, r, singular in _source_distance_tiles(x, y, sources, max_tile_elements):
+        contribution = A / np.sqrt(r) * np.cos(k * r - omega * t + phi)
+        contribution[singular] = 0.0
+        Z[rows] = contribution.sum(axis=0)
+    
+    return Z
+
+def complex_amplitude_field(x, y, sources, max_tile_elements=1 << 22):
+    """Complex amplitude U = sum A/sqrt(r) exp(i(k r + phi)) on the grid meshgrid(x, y).
+    
+    All sources share the angular frequency omega, so the displacement at
+    any time is Re[U exp(-i omega t)] (see harmonic_displacement).
+    """
+    U = np.zeros((np.size(y), np.size(x)), dtype=complex)
+    for rows, r, singular in _source_distance_tiles(x, y, sources, max_tile_elements):
+        contribution = A / np.sqrt(r) * np.exp(1j * (k * r + phi))
+        contribution[singular] = 0.0
+        U[rows] = contribution.sum(axis=0)
+    
+    return U
+
+def harmonic_displacement(U, t):
+    """Displacement Re[U exp(-i omega t)] from a precomputed complex amplitude field"""
+    return U.real * np.cos(omega * t) + U.imag * np.sin(omega * t)
+
+def intensity_map(U):
+    """Intensity |U|^2 of a complex amplitude field (twice the time average of the squared displacement)"""
+    return U.real**2 + U.imag**2
+
 def generate_polygon_vertices(n, radius=1.0, center=(0, 0)):
     vertices = []
     for i in range(n):
@@ -42,12 +99,8 @@ def generate_polygon_vertices(n, radius=1.0, center=(0, 0)):
 def plot_interference_pattern(sources, title, save_path=None, t=0, grid_size=100, plot_range=(-5, 5)):
     x = np.linspace(plot_range[0], plot_range[1], grid_size)
     y = np.linspace(plot_range[0], plot_range[1], grid_size)
-    X, Y = np.meshgrid(x, y)
     
-    Z = np.zeros_like(X)
-    for i in range(grid_size):
-        for j in range(grid_size):
-            Z[i, j] = calculate_total_displacement(X[i, j], Y[i, j], t, sources)
+    Z = displacement_field(x, y, t, sources)
     
     fig, ax = plt.subplots(figsize=(10, 8))
     
@@ -76,10 +129,7 @@ def plot_3d_interference_pattern(sources, title, save_path=None, t=0, grid_size=
     y = np.linspace(plot_range[0], plot_range[1], grid_size)
     X, Y = np.meshgrid(x, y)
     
-    Z = np.zeros_like(X)
-    for i in range(grid_size):
-        for j in range(grid_size):
-            Z[i, j] = calculate_total_displacement(X[i, j], Y[i, j], t, sources)
+    Z = displacement_field(x, y, t, sources)
     
     fig = plt.figure(figsize=(12, 10))
     ax = fig.add_subplot(111, projection='3d')
@@ -105,12 +155,12 @@ def plot_3d_interference_pattern(sources, title, save_path=None, t=0, grid_size=
     
     return fig, ax
 
-def create_interference_animation(sources, title, save_path=None, duration=2.0, fps=20, grid_size=100, plot_range=(-5, 5)):
+def create_interference_animation(sources, title, save_path=None, duration=2.0, fps=20, grid_size=100, plot_range=(-5, 5),
+                                  time_harmonic=True):
     fig, ax = plt.subplots(figsize=(10, 8))
     
     x = np.linspace(plot_range[0], plot_range[1], grid_size)
     y = np.linspace(plot_range[0], plot_range[1], grid_size)
-    X, Y = np.meshgrid(x, y)
     
     n_frames = int(duration * fps)
     times = np.linspace(0, duration, n_frames)
@@ -130,12 +180,14 @@ def create_interference_animation(sources, title, save_path=None, duration=2.0,
     ax.set_ylabel('y', fontsize=12)
     ax.set_title(title, fontsize=14)
     
+    # Time-harmonic mode: compute the complex amplitude once, each frame is a phase rotation
+    U = complex_amplitude_field(x, y, sources) if time_harmonic else None
+    
     def update(frame):
-        t = times[frame]
-        Z = np.zeros_like(X)
-        for i in range(grid_size):
-            for j in range(grid_size):
-                Z[i, j] = calculate_total_displacement(X[i, j], Y[i, j], t, sources)
+        if time_harmonic:
+            Z = harmonic_displacement(U, times[frame])
+        else:
+            Z = displacement_field(x, y, times[frame], sources)
         im.set_array(Z)
         return [im]
     
@@ -146,41 +198,58 @@ def create_interference_animation(sources, title, save_path=None, duration=2.0,
     
     return anim
 
-def analyze_polygon_interference(n_vertices_list=[3, 4, 5, 6], radius=3.0, plot_range=(-5, 5)):
-    for n_vertices in n_vertices_list:
-        sources = generate_polygon_vertices(n_vertices, radius=radius)
-        
-        if n_vertices == 3:
-            polygon_name = "Triangle"
-        elif n_vertices == 4:
-            polygon_name = "Square"
-        elif n_vertices == 5:
-            polygon_name = "Pentagon"
-        elif n_vertices == 6:
-            polygon_name = "Hexagon"
-        else:
-            polygon_name = f"{n_vertices}-gon"
-        
-        plot_interference_pattern(
-            sources,
-            f"Interference Pattern for {polygon_name}",
-            save_path=os.path.join(image_dir, f"{polygon_name.lower()}_interference_2d.png"),
-            grid_size=200
-        )
-        
-        plot_3d_interference_pattern(
-            sources,
-            f"3D Interference Pattern for {polygon_name}",
-            save_path=os.path.join(image_dir, f"{polygon_name.lower()}_interference_3d.png"),
-            grid_size=100
-        )
-        
-        create_interference_animation(
-            sources,
-            f"Interference Animation for {polygon_name}",
-            save_path=os.path.join(image_dir, f"{polygon_name.lower()}_interference_animation.gif"),
-            grid_size=100
-        )
+def polygon_name(n_vertices):
+    if n_vertices == 3:
+        return "Triangle"
+    elif n_vertices == 4:
+        return "Square"
+    elif n_vertices == 5:
+        return "Pentagon"
+    elif n_vertices == 6:
+        return "Hexagon"
+    return f"{n_vertices}-gon"
+
+def polygon_figure_paths(n_vertices):
+    name = polygon_name(n_vertices).lower()
+    return [os.path.join(image_dir, f"{name}_interference_2d.png"),
+            os.path.join(image_dir, f"{name}_interference_3d.png"),
+            os.path.join(image_dir, f"{name}_interference_animation.gif")]
+
+def generate_polygon_figures(n_vertices, radius=3.0, plot_range=(-5, 5)):
+    sources = generate_polygon_vertices(n_vertices, radius=radius)
+    name = polygon_name(n_vertices)
+    path_2d, path_3d, path_animation = polygon_figure_paths(n_vertices)
+    
+    plot_interference_pattern(
+        sources,
+        f"Interference Pattern for {name}",
+        save_path=path_2d,
+        grid_size=200
+    )
+    
+    plot_3d_interference_pattern(
+        sources,
+        f"3D Interference Pattern for {name}",
+        save_path=path_3d,
+        grid_size=100
+    )
+    
+    create_interference_animation(
+        sources,
+        f"Interference Animation for {name}",
+        save_path=path_animation,
+        grid_size=100
+    )
+
+def figure_targets(n_vertices_list=[3, 4, 5, 6], radius=3.0, plot_range=(-5, 5)):
+    return [figure_target(generate_polygon_figures, polygon_figure_paths(n_vertices),
+                          params=dict(n_vertices=n_vertices, radius=radius, plot_range=plot_range),
+                          name=f"{polygon_name(n_vertices).lower()}_interference")
+            for n_vertices in n_vertices_list]
+
+def analyze_polygon_interference(n_vertices_list=[3, 4, 5, 6], radius=3.0, plot_range=(-5, 5),
+                                 force=False, dry_run=False):
+    build_figures(figure_targets(n_vertices_list, radius, plot_range), force=force, dry_run=dry_run)
 
 if __name__ == "__main__":
     analyze_polygon_interference()
@@ -0,0 +1,93 @@
+import random
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from equivalent_resistance import (WorkingCircuit, calculate_equivalent_resistance, create_example_circuits,
+                                   list_triangles)
+from resistor_network import (nodal_equivalent_resistance, netlist_from_graph, resistance_matrix,
+                              resistance_query, grid_netlist)
+
+
+def series_parallel_circuit(rng, depth):
+    """Random two-terminal series-parallel circuit between nodes 0 and 1"""
+    G = nx.MultiGraph()
+    G.add_nodes_from([0, 1])
+    next_node = [2]
+    
+    def build(u, v, level):
+        if level == 0 or rng.random() < 0.3:
+            G.add_edge(u, v, resistance=rng.uniform(1, 100))
+        elif rng.random() < 0.5:
+            w = next_node[0]
+            next_node[0] += 1
+            build(u, w, level - 1)
+            build(w, v, level - 1)
+        else:
+            build(u, v, level - 1)
+            build(u, v, level - 1)
+    
+    build(0, 1, depth)
+    return G
+
+
+def test_examples():
+    expected = {"Simple Series Circuit": 60.0, "Simple Parallel Circuit": 20 / 3,
+                "Mixed Series-Parallel Circuit": 104.28571428571428}
+    for G, source, target, name in create_example_circuits():
+        if name in expected:
+            resistance, steps = calculate_equivalent_resistance(G, source, target)
+            assert resistance == pytest.approx(expected[name])
+            assert steps[0][1] == "Initial Circuit"
+        else:
+            with pytest.raises(ValueError):
+                calculate_equivalent_resistance(G, source, target)
+            assert nodal_equivalent_resistance(G, source, target) > 0
+
+
+def test_reduction_matches_nodal_analysis():
+    rng = random.Random(1)
+    for _ in range(100):
+        G = series_parallel_circuit(rng, 6)
+        resistance, _ = calculate_equivalent_resistance(G, 0, 1)
+        assert resistance == pytest.approx(nodal_equivalent_resistance(G, 0, 1), rel=1e-10)
+        assert resistance == pytest.approx(calculate_equivalent_resistance(netlist_from_graph(G), 0, 1)[0])
+
+
+def test_delta_wye_reductions_match_nodal_analysis():
+    rng = random.Random(2)
+    reduced = 0
+    for seed in range(150):
+        G = nx.gnm_random_graph(8, 12, seed=seed)
+        if not nx.is_connected(G):
+            continue
+        for u, v in G.edges:
+            G[u][v]['resistance'] = rng.uniform(1, 10)
+        try:
+            resistance, _ = calculate_equivalent_resistance(G, 0, 7)
+        except ValueError:
+            continue
+        reduced += 1
+        assert resistance == pytest.approx(nodal_equivalent_resistance(G, 0, 7), rel=1e-10)
+    assert reduced > 20
+
+
+def test_triangle_index_follows_reductions():
+    G = nx.complete_graph(6)
+    nx.set_edge_attributes(G, 1.0, 'resistance')
+    circuit = WorkingCircuit(G)
+    circuit.delta_to_wye_transformation(0, 1, 2)
+    circuit.reduce_parallel(3, 4)
+    
+    simple = {node: set(neighbors) for node, neighbors in circuit.adjacency.items()}
+    assert circuit.triangles == {frozenset(triangle) for triangle in list_triangles(simple)}
+
+
+def test_resistance_matrix_and_queries_agree():
+    net = grid_netlist(12, 12)
+    R = resistance_matrix(net)
+    query = resistance_query(net)
+    sources, targets = np.array([0, 5, 143, 17]), np.array([143, 60, 0, 17])
+    np.testing.assert_allclose(query(sources, targets), R[sources, targets], rtol=1e-10)
+    assert query(0, 143) == pytest.approx(nodal_equivalent_resistance(net, 0, 143))
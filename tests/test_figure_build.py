@@ -0,0 +1,104 @@
+import importlib
+import sys
+import textwrap
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import figure_build
+from figure_build import (figure_target, target_record, stale_reason, build_figures, load_manifest,
+                          update_manifest)
+
+
+@pytest.fixture
+def figure_module(tmp_path, monkeypatch):
+    """Write a figure module into a directory that figure_build treats as src/; returns a loader"""
+    directory = tmp_path / 'src'
+    directory.mkdir()
+    monkeypatch.setattr(figure_build, 'script_dir', str(directory))
+    monkeypatch.syspath_prepend(str(directory))
+    
+    def load(source):
+        (directory / 'figure_mod.py').write_text(textwrap.dedent(source))
+        sys.modules.pop('figure_mod', None)
+        importlib.invalidate_caches()
+        return importlib.import_module('figure_mod')
+    
+    yield load
+    sys.modules.pop('figure_mod', None)
+
+
+SOURCE = '''
+    COLOR = 'red'
+
+    def _label(n):
+        return f"{n} points"
+
+    def make_figure(path, n=3):
+        with open(path, 'w') as f:
+            f.write(COLOR + _label(n))
+'''
+
+
+def target(module, tmp_path, **params):
+    return figure_target(module.make_figure, [str(tmp_path / 'out.png')],
+                         dict({'path': str(tmp_path / 'out.png')}, **params))
+
+
+def test_stale_reasons(tmp_path, figure_module):
+    module = figure_module(SOURCE)
+    manifest_path = str(tmp_path / 'manifest.json')
+    t = target(module, tmp_path)
+    
+    assert stale_reason(t, target_record(t), {}) == "not built yet"
+    assert build_figures([t], manifest_path=manifest_path) == ['make_figure']
+    manifest = load_manifest(manifest_path)
+    assert stale_reason(t, target_record(t), manifest) is None
+    assert build_figures([t], manifest_path=manifest_path) == []
+    
+    changed = target(module, tmp_path, n=4)
+    assert stale_reason(changed, target_record(changed), manifest) == "parameters changed"
+    
+    module = figure_module(SOURCE.replace("'red'", "'blue'"))
+    t = target(module, tmp_path)
+    assert stale_reason(t, target_record(t), manifest) == "changed figure_mod.COLOR"
+    
+    module = figure_module(SOURCE.replace('points', 'samples'))
+    t = target(module, tmp_path)
+    assert stale_reason(t, target_record(t), manifest) == "changed figure_mod._label"
+    
+    (tmp_path / 'out.png').unlink()
+    module = figure_module(SOURCE)
+    t = target(module, tmp_path)
+    assert stale_reason(t, target_record(t), manifest) == "missing out.png"
+
+
+def test_dry_run_writes_nothing(tmp_path, figure_module):
+    module = figure_module(SOURCE)
+    manifest_path = tmp_path / 'manifest.json'
+    t = target(module, tmp_path)
+    
+    assert build_figures([t], dry_run=True, manifest_path=str(manifest_path)) == ['make_figure']
+    assert not (tmp_path / 'out.png').exists()
+    assert not manifest_path.exists()
+
+
+def test_force_rebuilds_up_to_date_targets(tmp_path, figure_module):
+    module = figure_module(SOURCE)
+    manifest_path = str(tmp_path / 'manifest.json')
+    t = target(module, tmp_path)
+    build_figures([t], manifest_path=manifest_path)
+    assert build_figures([t], force=True, manifest_path=manifest_path) == ['make_figure']
+
+
+def test_builds_keep_each_others_records(tmp_path):
+    manifest_path = str(tmp_path / 'manifest.json')
+    update_manifest(manifest_path, 'existing', {'outputs': []})
+    names = [f'target_{k}' for k in range(100)]
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        list(pool.map(update_manifest, [manifest_path] * len(names), names,
+                      [{'outputs': [name]} for name in names]))
+    
+    manifest = load_manifest(manifest_path)
+    assert set(manifest) == set(names) | {'existing'}
+    assert manifest['target_7'] == {'outputs': ['target_7']}
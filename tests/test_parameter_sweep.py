@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+from scipy.integrate import solve_ivp
+from scipy.optimize import OptimizeResult
+
+from parameter_sweep import (parameter_grid, parameter_hash, save_result, load_result, run_sweep,
+                             load_sweep)
+
+
+def decay(rate, t_end=1.0):
+    return solve_ivp(lambda t, y: -rate * y, (0, t_end), [1.0])
+
+
+def test_parameter_grid_last_axis_fastest():
+    assert parameter_grid(a=[1, 2], b=[3, 4]) == [
+        {'a': 1, 'b': 3}, {'a': 1, 'b': 4}, {'a': 2, 'b': 3}, {'a': 2, 'b': 4}]
+
+
+def test_parameter_hash_depends_on_array_contents():
+    case = {'x': np.arange(3.0)}
+    assert parameter_hash(decay, case) == parameter_hash(decay, {'x': np.arange(3.0)})
+    assert parameter_hash(decay, case) != parameter_hash(decay, {'x': np.arange(1.0, 4.0)})
+    assert parameter_hash(decay, case) != parameter_hash(decay, {'x': np.arange(3, dtype=np.int64)})
+
+
+@pytest.mark.parametrize('result', [
+    np.linspace(0, 1, 5),
+    (np.ones(3), None, np.arange(2)),
+    {'a': np.eye(2), 'b': 3.5, 'c': None},
+])
+def test_round_trip(tmp_path, result):
+    path = str(tmp_path / 'result.npz')
+    save_result(path, result, {'case': 1})
+    loaded, params = load_result(path, with_params=True)
+    
+    assert params == {'case': 1}
+    if isinstance(result, dict):
+        assert loaded.keys() == result.keys()
+        for key, value in result.items():
+            assert loaded[key] is None if value is None else np.array_equal(loaded[key], value)
+    elif isinstance(result, tuple):
+        assert len(loaded) == len(result)
+        for item, expected in zip(loaded, result):
+            assert item is None if expected is None else np.array_equal(item, expected)
+    else:
+        np.testing.assert_array_equal(loaded, result)
+
+
+def test_ode_result_keeps_class_and_none_fields(tmp_path):
+    path = str(tmp_path / 'ode.npz')
+    result = decay(2.0)
+    save_result(path, result)
+    loaded = load_result(path)
+    
+    assert type(loaded) is type(result)
+    assert loaded.keys() == result.keys()
+    assert loaded.sol is None and loaded.t_events is None and loaded.y_events is None
+    np.testing.assert_array_equal(loaded.y, result.y)
+    assert loaded.success == result.success and loaded.message == result.message
+
+
+def test_optimize_result_round_trip(tmp_path):
+    path = str(tmp_path / 'opt.npz')
+    save_result(path, OptimizeResult(x=np.ones(2), fun=0.5, jac=None))
+    loaded = load_result(path)
+    assert isinstance(loaded, OptimizeResult) and loaded.jac is None and loaded.fun == 0.5
+
+
+def test_unknown_result_classes_are_refused(tmp_path):
+    path = str(tmp_path / 'bad.npz')
+    
+    class Custom(dict):
+        pass
+    
+    with pytest.raises(TypeError):
+        save_result(path, Custom(a=1))
+    
+    np.savez(path, __kind__=np.array('dict:os:system'), __params__=np.array('null'))
+    with pytest.raises(ValueError):
+        load_result(path)
+
+
+def test_run_sweep_resumes_from_store(tmp_path):
+    calls = []
+    
+    def square(x):
+        calls.append(x)
+        return np.array([x * x])
+    
+    cases = parameter_grid(x=[1, 2, 3])
+    first = run_sweep(square, cases, store_dir=str(tmp_path))
+    assert calls == [1, 2, 3]
+    
+    second = run_sweep(square, cases + [{'x': 4}], store_dir=str(tmp_path))
+    assert calls == [1, 2, 3, 4]
+    assert [int(r[0]) for r in second] == [1, 4, 9, 16]
+    assert all(np.array_equal(a, b) for a, b in zip(first, second))
+    
+    params, results = load_sweep(str(tmp_path))
+    assert sorted(p['x'] for p in params) == [1, 2, 3, 4]
+
+
+def test_run_sweep_process_pool_matches_serial():
+    cases = [{'rate': rate} for rate in (0.5, 1.0, 2.0, 4.0)]
+    serial = run_sweep(decay, cases)
+    pooled = run_sweep(decay, cases, n_workers=2)
+    for a, b in zip(serial, pooled):
+        np.testing.assert_array_equal(a.y, b.y)
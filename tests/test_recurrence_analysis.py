@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from recurrence_analysis import recurrence_matrix, recurrence_quantification
+
+
+def series(kind, n=1500):
+    rng = np.random.default_rng(0)
+    if kind == 'sine':
+        return np.sin(np.linspace(0, 40, n))
+    if kind == 'noise':
+        return rng.random(n)
+    x = np.empty(n)
+    x[0] = 0.4
+    for k in range(1, n):
+        x[k] = 3.8 * x[k - 1] * (1 - x[k - 1])
+    return x
+
+
+@pytest.mark.parametrize('kind', ['sine', 'noise', 'logistic'])
+@pytest.mark.parametrize('p', [1, 2, np.inf])
+def test_packed_matches_sparse(kind, p):
+    x = series(kind)
+    threshold = 0.1 * np.std(x)
+    sparse_R = recurrence_matrix(x, threshold, dimension=2, delay=2, p=p)
+    packed_R = recurrence_matrix(x, threshold, dimension=2, delay=2, p=p, output='packed',
+                                 max_block_bytes=50_000)
+    
+    unpacked = np.unpackbits(packed_R, axis=1, count=sparse_R.shape[0]).astype(bool)
+    np.testing.assert_array_equal(unpacked, sparse_R.toarray())
+    
+    expected = recurrence_quantification(sparse_R)
+    assert recurrence_quantification(packed_R, max_block_bytes=10_000) == expected
+    assert recurrence_quantification(sparse_R.toarray().astype(float)) == expected
+
+
+def test_line_measures_of_a_known_matrix():
+    # Off the identity: one diagonal line of length 3 (both triangles) and isolated points
+    R = np.eye(8, dtype=bool)
+    for i in range(3):
+        R[i, i + 4] = R[i + 4, i] = True
+    R[7, 1] = R[1, 7] = True
+    packed = np.packbits(R, axis=1)
+    
+    rqa = recurrence_quantification(packed)
+    assert rqa['recurrence_rate'] == pytest.approx(8 / 56)
+    assert rqa['determinism'] == pytest.approx(6 / 8)
+    assert rqa == recurrence_quantification(R.astype(float))
+
+
+def test_rejects_other_arrays():
+    with pytest.raises(TypeError):
+        recurrence_quantification(np.zeros((10, 3)))
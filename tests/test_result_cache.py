@@ -0,0 +1,156 @@
+import importlib
+import os
+import sys
+import textwrap
+
+import numpy as np
+import pytest
+from scipy.integrate import solve_ivp
+
+import figure_build
+import result_cache
+from result_cache import cached, cache_entries, prune_cache
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    directory = tmp_path / 'cache'
+    monkeypatch.setenv('SIMULATION_CACHE_DIR', str(directory))
+    monkeypatch.delenv('SIMULATION_CACHE', raising=False)
+    result_cache.code_hash.cache_clear()
+    yield directory
+    result_cache.code_hash.cache_clear()
+
+
+@pytest.fixture
+def local_modules(tmp_path, monkeypatch):
+    """Write modules into a directory that figure_build treats as src/"""
+    directory = tmp_path / 'modules'
+    directory.mkdir()
+    monkeypatch.setattr(figure_build, 'script_dir', str(directory))
+    monkeypatch.syspath_prepend(str(directory))
+    written = []
+    
+    def write(name, source):
+        (directory / f'{name}.py').write_text(textwrap.dedent(source))
+        sys.modules.pop(name, None)
+        written.append(name)
+        importlib.invalidate_caches()
+    
+    yield write
+    for name in written:
+        sys.modules.pop(name, None)
+
+
+def test_hit_skips_the_call(cache_dir):
+    calls = []
+    
+    @cached
+    def simulate(n, scale=1.0):
+        calls.append(n)
+        return np.arange(n) * scale, n
+    
+    first = simulate(4)
+    second = simulate(4, scale=1.0)
+    assert calls == [4]
+    np.testing.assert_array_equal(first[0], second[0])
+    
+    simulate(5)
+    assert calls == [4, 5]
+    assert len(cache_entries(str(cache_dir))) == 2
+
+
+def test_hit_returns_the_same_ode_result(cache_dir):
+    @cached
+    def decay(rate):
+        return solve_ivp(lambda t, y: -rate * y, (0, 1), [1.0])
+    
+    fresh = decay.uncached(2.0)
+    decay(2.0)
+    hit = decay(2.0)
+    assert type(hit) is type(fresh)
+    assert hit.keys() == fresh.keys()
+    assert hit.sol is None and hit.t_events is None and hit.y_events is None
+    np.testing.assert_array_equal(hit.y, fresh.y)
+
+
+def test_disabled_cache_always_calls(cache_dir, monkeypatch):
+    monkeypatch.setenv('SIMULATION_CACHE', '0')
+    calls = []
+    
+    @cached
+    def simulate(n):
+        calls.append(n)
+        return np.zeros(n)
+    
+    simulate(3)
+    simulate(3)
+    assert calls == [3, 3]
+    assert not cache_dir.exists()
+
+
+def test_editing_a_dependency_invalidates(cache_dir, local_modules):
+    local_modules('cache_helper', '''
+        import numpy as np
+
+        def step(x):
+            return x + 1
+    ''')
+    local_modules('cache_sim', '''
+        import numpy as np
+        import cache_helper
+        from result_cache import cached
+
+        SCALE = 2.0
+
+        def _inner(n):
+            return np.array([cache_helper.step(k) for k in range(n)])
+
+        @cached
+        def simulate(n):
+            return SCALE * _inner(n)
+    ''')
+    sim = importlib.import_module('cache_sim')
+    key = result_cache.cache_key(sim.simulate.uncached, (3,), {})
+    np.testing.assert_array_equal(sim.simulate(3), [2, 4, 6])
+    
+    def key_after_edit(name, source):
+        local_modules(name, source)
+        sys.modules.pop('cache_sim', None)
+        result_cache.code_hash.cache_clear()
+        module = importlib.import_module('cache_sim')
+        return result_cache.cache_key(module.simulate.uncached, (3,), {}), module
+    
+    # Another module the function calls into
+    new_key, sim = key_after_edit('cache_helper', '''
+        import numpy as np
+
+        def step(x):
+            return x + 2
+    ''')
+    assert new_key != key
+    np.testing.assert_array_equal(sim.simulate(3), [4, 6, 8])
+    
+    # A helper function and a constant in the defining module
+    with open(os.path.join(figure_build.script_dir, 'cache_sim.py')) as f:
+        source = f.read()
+    edited_key, _ = key_after_edit('cache_sim', source.replace('SCALE = 2.0', 'SCALE = 3.0'))
+    assert edited_key != new_key
+    inner_key, _ = key_after_edit('cache_sim', source.replace('for k in range(n)', 'for k in range(n) if True'))
+    assert inner_key not in (new_key, edited_key)
+    
+    # Unrelated code in the defining module leaves the key alone
+    same_key, _ = key_after_edit('cache_sim', source + '\ndef unrelated():\n    return 1\n')
+    assert same_key == new_key
+
+
+def test_prune_evicts_least_recently_used(cache_dir):
+    cache_dir.mkdir()
+    for k, name in enumerate(['old', 'middle', 'new']):
+        path = cache_dir / f'{name}.npz'
+        np.savez(path, data=np.zeros(1000))
+        os.utime(path, (1000 + k, 1000 + k))
+    
+    size = os.path.getsize(cache_dir / 'new.npz')
+    prune_cache(max_size=2 * size, directory=str(cache_dir))
+    assert sorted(p.name for p in cache_dir.iterdir()) == ['middle.npz', 'new.npz']